@@ -0,0 +1,61 @@
+# lane_detection/benchmarks/bench_color_segmentation.py
+# Compare the lane paint lookup table with per-frame HLS thresholding
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lane_detection_lib.common import cv2  # noqa: E402
+from lane_detection_lib.image.color_segmentation import (  # noqa: E402
+    segment_lane_colors, LaneCue, DEFAULT_COLOR_THRESHOLDS)
+from lane_detection_lib.route_processing.pipeline import (  # noqa: E402
+    LanePipeline)
+
+IMAGE_PATH = Path(__file__).resolve().parents[1] / "data/input/test_route.jpeg"
+
+
+def time_call(function, repeat: int = 50) -> tuple[object, float]:
+    """Return the last result and the mean runtime in milliseconds."""
+    result = function()  # Warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def segment_hls(image):
+    """Reference segmentation: HLS conversion and two range checks."""
+    thresholds = DEFAULT_COLOR_THRESHOLDS
+    hls = cv2.cvtColor(image, cv2.COLOR_BGR2HLS)
+    white = cv2.inRange(
+        hls,
+        (0, thresholds.white_lightness[0], thresholds.white_saturation[0]),
+        (180, thresholds.white_lightness[1], thresholds.white_saturation[1]))
+    yellow = cv2.inRange(
+        hls, (thresholds.yellow_hue[0], thresholds.yellow_lightness[0],
+              thresholds.yellow_saturation[0]),
+        (thresholds.yellow_hue[1], thresholds.yellow_lightness[1],
+         thresholds.yellow_saturation[1]))
+    return cv2.bitwise_or(white, yellow)
+
+
+if __name__ == "__main__":
+    source = cv2.imread(str(IMAGE_PATH))
+    frame = cv2.resize(source, None, fx=0.5, fy=0.5)
+
+    reference, hls_ms = time_call(lambda: segment_hls(frame))
+    mask, lut_ms = time_call(lambda: segment_lane_colors(frame))
+    print(f"HLS thresholds {hls_ms:6.2f} ms, lookup table {lut_ms:6.2f} ms, "
+          f"{(mask == reference).mean():.1%} pixels agree")
+
+    for lane_cue in LaneCue:
+        pipeline = LanePipeline(lane_cue=lane_cue)
+        geometry = pipeline.prepare(source.shape)
+        cue = cv2.bitwise_and(pipeline._lane_cue_mask(frame),
+                              geometry.roi_mask)
+        _, total_ms = time_call(
+            lambda: pipeline.process(source, render=False), repeat=10)
+        print(f"{lane_cue.name:16s} {cv2.countNonZero(cue):6d} cue pixels, "
+              f"{total_ms:6.1f} ms per frame")
@@ -0,0 +1,74 @@
+# lane_detection/benchmarks/bench_line_fitting.py
+# Compare RANSAC lane fitting with the least-squares polyfit path
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lane_detection_lib.draw.line_fitting import (  # noqa: E402
+    fit_lane_ransac, lane_endpoints)
+from lane_detection_lib.draw.lines_detection import (  # noqa: E402
+    _fit_line_points)
+
+HEIGHT, WIDTH = 1000, 1500
+TRUE_SLOPE, TRUE_INTERCEPT = -1.2, 1400.0
+
+
+def lane_points(n_points: int, outlier_ratio: float,
+                rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """Segment endpoints along a lane, with noise and gross outliers."""
+    y_coords = rng.integers(int(HEIGHT * 0.6), HEIGHT, n_points)
+    x_coords = TRUE_SLOPE * y_coords + TRUE_INTERCEPT + rng.normal(
+        0, 1.5, n_points)
+
+    outliers = rng.random(n_points) < outlier_ratio
+    x_coords[outliers] = rng.integers(0, WIDTH // 2, outliers.sum())
+    return np.rint(x_coords).astype(int), y_coords
+
+
+def endpoint_error(line) -> float:
+    """Largest endpoint distance, in pixels, from the true lane."""
+    if line is None:
+        return float("nan")
+    truth = lane_endpoints(TRUE_SLOPE, TRUE_INTERCEPT, HEIGHT)
+    return max(abs(a - b) for a, b in zip(line, truth))
+
+
+def time_fit(function, repeat: int = 200) -> tuple[object, float]:
+    """Return the last result and the mean runtime in microseconds."""
+    result = function()  # Warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat * 1e6
+
+
+def polyfit(x_coords: np.ndarray, y_coords: np.ndarray):
+    """The existing fit, returning None where it raises."""
+    try:
+        return _fit_line_points(x_coords, y_coords, HEIGHT, WIDTH)
+    except ValueError:
+        return None
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+
+    for n_points in (20, 200, 2000):
+        for outlier_ratio in (0.0, 0.2, 0.4):
+            x_coords, y_coords = lane_points(n_points, outlier_ratio, rng)
+
+            line, poly_us = time_fit(lambda: polyfit(x_coords, y_coords))
+            fit, ransac_us = time_fit(
+                lambda: fit_lane_ransac(x_coords, y_coords, HEIGHT))
+
+            print(f"{n_points:5d} points, {outlier_ratio:.0%} outliers: "
+                  f"polyfit {poly_us:7.1f} us error "
+                  f"{endpoint_error(line):6.1f} px | ransac "
+                  f"{ransac_us:7.1f} us error "
+                  f"{endpoint_error(fit.line):6.1f} px, inliers "
+                  f"{fit.inlier_ratio:.2f}, confidence {fit.confidence:.3f}")
@@ -0,0 +1,62 @@
+# lane_detection/benchmarks/bench_pyramid.py
+# Compare coarse-to-fine detection with the full-resolution pipeline
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lane_detection_lib.common import cv2  # noqa: E402
+from lane_detection_lib.route_processing.pipeline import (  # noqa: E402
+    LanePipeline)
+from lane_detection_lib.route_processing.pyramid import (  # noqa: E402
+    PyramidDetector)
+
+IMAGE_PATH = Path(__file__).resolve().parents[1] / "data/input/test_route.jpeg"
+
+
+def time_call(function, repeat: int = 5) -> tuple[object, float]:
+    """Return the last result and the mean runtime in milliseconds."""
+    result = function()  # Warm up
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+def max_deviation(reference, candidate) -> float:
+    """Largest endpoint difference, in pixels, between two lane results.
+
+    A lane found by only one of the two results counts as infinite.
+    """
+    if any((ref_line is None) != (line is None)
+           for ref_line, line in zip(reference[:2], candidate[:2])):
+        return float("inf")
+
+    deviations = [abs(a - b)
+                  for ref_line, line in zip(reference[:2], candidate[:2])
+                  if ref_line is not None and line is not None
+                  for a, b in zip(ref_line, line)]
+    return max(deviations, default=float("nan"))
+
+
+if __name__ == "__main__":
+    source = cv2.imread(str(IMAGE_PATH))
+    pipeline = LanePipeline(scale=0.5)
+
+    # Small frames make lane segments short at the coarse level; the
+    # sample also runs at its native size
+    native = (source.shape[1], source.shape[0])
+    for width, height in ((1500, 1000), native, (7680, 4320)):
+        frame = cv2.resize(source, (width, height))
+        reference, full_ms = time_call(
+            lambda: pipeline.process(frame, render=False))
+        print(f"{width}x{height} full pipeline {full_ms:8.1f} ms")
+
+        for coarse_scale in (0.25, 0.125):
+            detector = PyramidDetector(pipeline, coarse_scale=coarse_scale)
+            lanes, pyramid_ms = time_call(lambda: detector.detect(frame))
+            print(f"{width}x{height} pyramid 1/{round(1 / coarse_scale)} "
+                  f"{pyramid_ms:8.1f} ms, max deviation "
+                  f"{max_deviation(reference, lanes):.0f} px")
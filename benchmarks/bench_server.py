@@ -0,0 +1,52 @@
+# lane_detection/benchmarks/bench_server.py
+# Throughput and latency of the server per batching window and pool size
+
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from lane_detection_lib.common import cv2  # noqa: E402
+from lane_detection_lib.route_processing.pipeline import (  # noqa: E402
+    LanePipeline)
+from lane_detection_lib.service.client import (  # noqa: E402
+    format_report, run_load)
+from lane_detection_lib.service.server import create_server  # noqa: E402
+
+IMAGE_PATH = Path(__file__).resolve().parents[1] / "data/input/test_route.jpeg"
+
+
+def measure(frame: bytes, max_wait: float, workers: int,
+            concurrency: int = 4, requests: int = 80) -> str:
+    """Serve on a temporary Unix socket and run a load against it."""
+    address = os.path.join(tempfile.mkdtemp(), "lanes.sock")
+    server = create_server(address, LanePipeline(), max_wait=max_wait,
+                           workers=workers)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        run_load(address, frame, concurrency, concurrency)  # Warm up
+        report = run_load(address, frame, concurrency, requests)
+    finally:
+        server.shutdown()
+        server.server_close()
+        server.batcher.close()
+        os.unlink(address)
+
+    batcher = server.batcher
+    return (f"{format_report(report)}, "
+            f"{batcher.frames / batcher.batches:.2f} frames per batch")
+
+
+if __name__ == "__main__":
+    source = cv2.resize(cv2.imread(str(IMAGE_PATH)), (1500, 1000))
+    frame = cv2.imencode(".jpg", source)[1].tobytes()
+
+    print(f"{os.cpu_count()} CPU(s)")
+    for workers in sorted({1, 2, min(os.cpu_count() or 1, 4)}):
+        for max_wait in (0.0, 0.002, 0.010):
+            print(f"workers={workers} max_wait={max_wait * 1000:4.1f} ms: "
+                  f"{measure(frame, max_wait, workers)}")
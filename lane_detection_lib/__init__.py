@@ -0,0 +1,3 @@
+# lane_detection/lane_detection_lib/__init__.py
+
+__version__ = "0.1.0"
@@ -0,0 +1,151 @@
+# lane_detection/lane_detection_lib/draw/line_fitting.py
+# Robust lane line fitting
+
+from typing import NamedTuple, Optional
+
+from ..common import Enum, np
+
+
+class FitMethod(Enum):
+    """Enum for lane line fitting methods."""
+    polyfit = 0  # Least squares over all endpoints (np.polyfit)
+    ransac = 1  # Vectorized RANSAC with a least-squares refinement
+
+
+class LineFit(NamedTuple):
+    """A fitted lane line with its quality measures."""
+    line: Optional[tuple[int, ...]]  # (x_start, y_start, x_end, y_end)
+    inlier_ratio: float  # Fraction of the points explained by the line
+    confidence: float  # Probability that an all-inlier sample was drawn
+
+
+def least_squares_line(x_coords: np.ndarray, y_coords: np.ndarray,
+                       weights: Optional[np.ndarray] = None
+                       ) -> tuple[float, float] | None:
+    """Closed-form (weighted) least squares fit of x = slope * y + b."""
+    y_mean = np.average(y_coords, weights=weights)
+    x_mean = np.average(x_coords, weights=weights)
+    y_centered = y_coords - y_mean
+    weighted = y_centered if weights is None else y_centered * weights
+    variance = np.dot(weighted, y_centered)
+
+    # All points on one row, x is not a function of y
+    if variance == 0:
+        return None
+
+    slope = np.dot(weighted, x_coords - x_mean) / variance
+    return float(slope), float(x_mean - slope * y_mean)
+
+
+def lane_endpoints(slope: float, intercept: float,
+                   height: int) -> tuple[int, ...]:
+    """Endpoints of a lane from the bottom to 65% of the image height."""
+    y_start = height  # Start from the bottom
+    y_end = int(height * 0.65)  # Extend to 65% of the image height
+    return (int(slope * y_start + intercept), y_start,
+            int(slope * y_end + intercept), y_end)
+
+
+def fit_lane_ransac(x_coords: np.ndarray, y_coords: np.ndarray, height: int,
+                    weights: Optional[np.ndarray] = None,
+                    inlier_threshold: float = 5.0, batch_size: int = 64,
+                    max_hypotheses: int = 512, target_confidence: float = 0.99,
+                    seed: int = 0) -> LineFit:
+    """Fit a lane line x = f(y) robustly, never raising on a bad fit.
+
+    Hypotheses are drawn ``batch_size`` at a time from random point pairs
+    and all of them are scored against all points in one NumPy operation,
+    each inlier counting for its weight (1 by default).
+    Sampling stops as soon as enough hypotheses were drawn to reach
+    ``target_confidence`` for the best inlier ratio seen, or after
+    ``max_hypotheses``. The best hypothesis is refined by least squares on
+    its inliers. The fitted endpoints may lie outside the image, and the
+    inlier ratio is the share of the total weight explained by the line.
+    """
+    x_coords = np.asarray(x_coords, dtype=np.float64)
+    y_coords = np.asarray(y_coords, dtype=np.float64)
+    n_points = len(x_coords)
+
+    if n_points < 2:
+        return LineFit(None, 0.0, 0.0)
+
+    if weights is not None:
+        weights = np.asarray(weights, dtype=np.float64)
+        if not weights.sum() > 0:
+            return LineFit(None, 0.0, 0.0)
+
+    rng = np.random.default_rng(seed)
+    best_inliers = None
+    best_score = 0.0
+    best_count = 0
+    drawn = 0
+
+    while drawn < max_hypotheses:
+        # Random pairs of distinct points, one hypothesis each
+        first = rng.integers(0, n_points, batch_size)
+        second = (first + rng.integers(1, n_points, batch_size)) % n_points
+        drawn += batch_size
+
+        dy = y_coords[second] - y_coords[first]
+        valid = dy != 0
+        if not valid.any():
+            continue
+        first, second, dy = first[valid], second[valid], dy[valid]
+
+        slopes = (x_coords[second] - x_coords[first]) / dy
+        intercepts = x_coords[first] - slopes * y_coords[first]
+
+        # Score every hypothesis against every point at once
+        residuals = slopes[:, None] * y_coords
+        residuals += intercepts[:, None]
+        residuals -= x_coords
+        inliers = np.abs(residuals, out=residuals) <= inlier_threshold
+        counts = np.count_nonzero(inliers, axis=1)
+        scores = counts if weights is None else inliers @ weights
+
+        best = int(scores.argmax())
+        if scores[best] > best_score:
+            best_score = float(scores[best])
+            best_count = int(counts[best])
+            best_inliers = inliers[best]
+
+        # Adaptive termination on the best inlier ratio so far, none yet
+        # means there is no bound on the hypotheses needed
+        sample_success = (best_count / n_points) ** 2
+        if sample_success >= 1 or sample_success > 0 and drawn >= (
+                np.log(1 - target_confidence) / np.log(1 - sample_success)):
+            break
+
+    if best_inliers is None:
+        return LineFit(None, 0.0, 0.0)
+
+    fit = least_squares_line(
+        x_coords[best_inliers], y_coords[best_inliers],
+        None if weights is None else weights[best_inliers])
+    if fit is None:
+        return LineFit(None, 0.0, 0.0)
+
+    total = n_points if weights is None else weights.sum()
+    inlier_ratio = best_score / total
+    confidence = 1 - (1 - (best_count / n_points) ** 2) ** drawn
+
+    return LineFit(lane_endpoints(*fit, height), inlier_ratio,
+                   float(confidence))
+
+
+def fit_lane_segments(detected_lines: np.ndarray, height: int,
+                      **kwargs) -> LineFit:
+    """Fit a lane line robustly to the endpoints of (N, 4) segments.
+
+    Each endpoint is weighted by the length of its segment, so long
+    segments outvote short ones as they do in the Hough accumulator.
+    """
+    if len(detected_lines) == 0:
+        return LineFit(None, 0.0, 0.0)
+
+    x1, y1, x2, y2 = detected_lines.T
+    lengths = np.hypot(x2 - x1, y2 - y1)
+
+    return fit_lane_ransac(detected_lines[:, ::2].ravel(),
+                           detected_lines[:, 1::2].ravel(), height,
+                           np.repeat(lengths, 2), **kwargs)
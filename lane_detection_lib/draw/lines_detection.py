@@ -2,8 +2,9 @@
 from typing import Optional
 
 from lane_detection_lib.image.color_conversion import convert_bgr2rgb
-from lane_detection_lib.image.edge_detection import detect_hough_lines
-from ..common import cv2, np, ImageType
+from lane_detection_lib.image.edge_detection import (detect_lines,
+                                                     LineDetectorType)
+from ..common import Enum, cv2, np, ImageType
 from ..image.io import get_image_dimensions
 
 
@@ -59,10 +60,7 @@ def separate_lines(
         image: ImageType, lines: np.ndarray,
         slope_threshold: float = 0.50) -> tuple[np.ndarray, np.ndarray]:
     """ Separates detected lines into left and right lane lines based on slope."""
-    left_lines = []
-    right_lines = []
     height, width = get_image_dimensions(image)
-    center_x = width // 2  # Center of the image
 
     # Return empty lists if no lines are detected
     if lines is None or len(lines) == 0:
@@ -71,22 +69,36 @@ def separate_lines(
     if not isinstance(lines, (list, np.ndarray)):
         raise TypeError("Lines must be a list or a NumPy array.")
 
-    for line in lines:
-        # Unpack the line coordinates and cast
-        x1, y1, x2, y2 = (int(coord) for coord in line[0])
-        slope = get_slope_line(line)
+    lines = np.asarray(lines)
+    if lines.ndim != 3 or lines.shape[1:] != (1, 4):
+        raise ValueError("Line must be a NumPy array with shape (1, 4).")
+
+    return _separate_lines(lines, width // 2, slope_threshold)
+
+
+def _separate_lines(lines: np.ndarray | None, center_x: int,
+                    slope_threshold: float) -> tuple[np.ndarray, np.ndarray]:
+    """Unchecked, vectorized variant of separate_lines."""
+    if lines is None:
+        return np.empty((0, 4), dtype=int), np.empty((0, 4), dtype=int)
+
+    lines = lines.reshape(-1, 4).astype(int)
+    x1, y1, x2, y2 = lines.T
+    h_dist = x2 - x1
+    v_dist = y2 - y1
 
-        # Ignore near-horizontal lines
-        if abs(slope) < slope_threshold:
-            continue
+    # Slope of each line, vertical lines get an infinite slope
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = np.where(h_dist != 0, v_dist / h_dist, np.inf)
 
-        # Separate left and right lines
-        if slope < 0 and x1 < center_x and x2 < center_x:
-            left_lines.append((x1, y1, x2, y2))
-        elif slope > 0 and x1 > center_x and x2 > center_x:
-            right_lines.append((x1, y1, x2, y2))
+    # Ignore near-horizontal lines
+    steep = np.abs(slopes) >= slope_threshold
 
-    return np.array(left_lines), np.array(right_lines)
+    # Separate left and right lines
+    left = steep & (slopes < 0) & (x1 < center_x) & (x2 < center_x)
+    right = steep & (slopes > 0) & (x1 > center_x) & (x2 > center_x)
+
+    return lines[left], lines[right]
 
 
 def fit_detected_line(image: ImageType,
@@ -102,8 +114,27 @@ def fit_detected_line(image: ImageType,
     x_coords, y_coords = get_all_line_coordinates(detected_lines)
 
     if len(x_coords) < 2 or len(y_coords) < 2:
-        raise None
+        return None
+
+    return _fit_line_points(x_coords, y_coords, height, width)
+
+
+def _fit_detected_line(detected_lines: np.ndarray, height: int,
+                       width: int) -> tuple[int, ...] | None:
+    """Unchecked variant of fit_detected_line for (N, 4) integer lines."""
+    if len(detected_lines) == 0:
+        return None
 
+    # Endpoints in the same order as get_all_line_coordinates
+    x_coords = detected_lines[:, ::2].ravel()
+    y_coords = detected_lines[:, 1::2].ravel()
+
+    return _fit_line_points(x_coords, y_coords, height, width)
+
+
+def _fit_line_points(x_coords: np.ndarray, y_coords: np.ndarray,
+                     height: int, width: int) -> tuple[int, ...]:
+    """Fit x = f(y) through the points and clip it to the lane region."""
     # Fit a line to the points (y = mx + b)
     poly = np.polyfit(y_coords, x_coords, 1)  # Reverse xy (Vertical lines)
     slope, intercept = poly
@@ -142,14 +173,16 @@ def draw_lines(img: ImageType, lines: np.ndarray) -> ImageType:
             raise ValueError("Each line must be a list, tuple, "
                              "or array of 4 integers (x1, y1, x2, y2).")
 
-        # Unpack the line coordinates and cast
-        x1, y1, x2, y2 = (int(coord) for coord in line[0])
+    # Draw all lines on the blank image in a single call
+    return _draw_lines(line_image, np.asarray(lines))
 
-        if not all(isinstance(int(coord), int) for coord in (x1, y1, x2, y2)):
-            raise ValueError("Line coordinates must be integers.")
 
-        # Draw each line on the blank image
-        cv2.line(line_image, (x1, y1), (x2, y2), (255, 0, 0), 5)
+def _draw_lines(line_image: ImageType, lines: np.ndarray,
+                color: tuple[int, int, int] = (255, 0, 0),
+                thickness: int = 5) -> ImageType:
+    """Draw (N, 1, 4) line segments into an image with one polylines call."""
+    segments = lines.reshape(-1, 2, 2).astype(np.int32)
+    cv2.polylines(line_image, segments, False, color, thickness)
     return line_image
 
 
@@ -159,6 +192,13 @@ def draw_lane_lines(image: ImageType, left_line: Optional[tuple[int, ...]],
     # Create a blank image to draw lines
     lane_image = np.zeros_like(image)
 
+    return _draw_lane_lines(lane_image, left_line, right_line)
+
+
+def _draw_lane_lines(lane_image: ImageType,
+                     left_line: Optional[tuple[int, ...]],
+                     right_line: Optional[tuple[int, ...]]) -> ImageType:
+    """Draws left and right lane lines into an existing image buffer."""
     # Draw the left lane line
     if left_line is not None:
         cv2.line(lane_image, (left_line[0], left_line[1]),
@@ -172,11 +212,90 @@ def draw_lane_lines(image: ImageType, left_line: Optional[tuple[int, ...]],
     return lane_image
 
 
+class RenderMode(Enum):
+    """Enum for lane overlay rendering strategies."""
+    full_frame = 0  # Blend a full-frame lane image over the whole frame
+    in_place = 1  # Blend only drawn pixels, inside the lines' bounding box
+
+
+def _lines_bounding_box(lines: list[np.ndarray], pad: int, height: int,
+                        width: int) -> tuple[int, int, int, int] | None:
+    """Bounding box (x0, y0, x1, y1) of all endpoints, padded and clipped."""
+    if not lines:
+        return None
+
+    points = np.concatenate([line.reshape(-1, 2) for line in lines])
+    x0, y0 = np.maximum(points.min(axis=0) - pad, 0)
+    x1, y1 = np.minimum(points.max(axis=0) + pad + 1, (width, height))
+    if x0 >= x1 or y0 >= y1:
+        return None
+
+    return int(x0), int(y0), int(x1), int(y1)
+
+
+def render_lanes_inplace(image: ImageType,
+                         left_line: Optional[tuple[int, ...]],
+                         right_line: Optional[tuple[int, ...]],
+                         fill_lane: bool = False,
+                         debug_lines: Optional[np.ndarray] = None,
+                         to_rgb: bool = False) -> ImageType:
+    """Draw lane lines, lane fill and debug segments directly into a frame.
+
+    Only the bounding box of the drawn geometry is touched: pixels covered
+    by the overlay are blended like ``detect_and_draw_lanes`` does, all
+    other pixels keep their values (they are not dimmed). The frame is
+    converted to RGB in place only when ``to_rgb`` is set.
+    """
+    height, width = image.shape[:2]
+
+    lane_lines = [np.array(line, dtype=np.int32)
+                  for line in (left_line, right_line) if line is not None]
+    geometry = list(lane_lines)
+    if debug_lines is not None and len(debug_lines) > 0:
+        geometry.append(np.asarray(debug_lines, dtype=np.int32))
+
+    # Pad by the half thickness of the widest (lane) line
+    box = _lines_bounding_box(geometry, 6, height, width)
+    if box is not None:
+        x0, y0, x1, y1 = box
+        region = image[y0:y1, x0:x1]
+        offset = np.array([x0, y0, x0, y0], dtype=np.int32)
+
+        # Draw the overlay in the region's coordinates
+        overlay = np.zeros_like(region)
+        if fill_lane and len(lane_lines) == 2:
+            left, right = (line - offset for line in lane_lines)
+            polygon = np.array([left[:2], left[2:], right[2:], right[:2]],
+                               dtype=np.int32)
+            cv2.fillPoly(overlay, [polygon], (0, 48, 0))
+
+        if debug_lines is not None and len(debug_lines) > 0:
+            _draw_lines(overlay, geometry[-1].reshape(-1, 4) - offset)
+
+        left, right = (None if line is None else
+                       tuple(int(v) for v in np.subtract(line, offset))
+                       for line in (left_line, right_line))
+        _draw_lane_lines(overlay, left, right)
+
+        # Blend only the pixels the overlay covers, writing through the view
+        covered = cv2.cvtColor(overlay, cv2.COLOR_BGR2GRAY)
+        blended = cv2.addWeighted(region, 0.8, overlay, 1, 1)
+        cv2.copyTo(blended, covered, region)
+
+    if to_rgb:
+        cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+
+    return image
+
+
 # ----------------- Main Lane Detection Pipeline -----------------
-def detect_and_draw_lanes(image: ImageType, edge_img: ImageType) -> ImageType:
+def detect_and_draw_lanes(
+        image: ImageType, edge_img: ImageType,
+        line_detector: LineDetectorType = LineDetectorType.hough_p
+) -> ImageType:
     """Detects and draws lane lines on the given image."""
     # Detect lines
-    lines = detect_hough_lines(edge_img)
+    lines = detect_lines(edge_img, line_detector)
 
     # Separate left and right lines
     left_lines, right_lines = separate_lines(image, lines, 0.4)
@@ -0,0 +1,116 @@
+# lane_detection/lane_detection_lib/image/color_segmentation.py
+# Lane paint segmentation with a color lookup table
+
+from functools import lru_cache
+from typing import NamedTuple
+
+from ..common import Enum, cv2, np, ImageType
+
+# Bits kept per BGR channel when indexing the lookup table
+DEFAULT_LUT_BITS = 5
+
+
+class LaneCue(Enum):
+    """Enum for the lane cues fed to the line detector."""
+    edges = 0  # Canny edges
+    color = 1  # White and yellow paint mask
+    edges_and_color = 2  # Canny edges on or next to lane paint
+
+
+class LaneColorThresholds(NamedTuple):
+    """HLS ranges of lane paint, with OpenCV's 0-180 hue scale."""
+    white_lightness: tuple[int, int] = (160, 255)
+    white_saturation: tuple[int, int] = (0, 80)
+    yellow_hue: tuple[int, int] = (15, 35)
+    yellow_lightness: tuple[int, int] = (100, 255)
+    yellow_saturation: tuple[int, int] = (100, 255)
+
+
+DEFAULT_COLOR_THRESHOLDS = LaneColorThresholds()
+
+
+def validate_color_thresholds(thresholds: LaneColorThresholds) -> None:
+    """Validate the HLS ranges of lane paint."""
+    if not isinstance(thresholds, LaneColorThresholds):
+        raise TypeError(
+            "thresholds must be an instance of LaneColorThresholds.")
+
+    for name, bounds in thresholds._asdict().items():
+        upper = 180 if name == "yellow_hue" else 255
+        if (not isinstance(bounds, tuple) or len(bounds) != 2
+                or not all(isinstance(bound, int) for bound in bounds)
+                or not 0 <= bounds[0] <= bounds[1] <= upper):
+            raise ValueError(
+                f"{name} must be an integer range within 0 and {upper}.")
+
+
+def validate_lut_bits(bits: int) -> None:
+    """Validate the number of bits kept per channel."""
+    if not isinstance(bits, int) or not 1 <= bits <= 8:
+        raise ValueError("bits must be an integer between 1 and 8.")
+
+
+@lru_cache(maxsize=8)
+def build_color_lut(thresholds: LaneColorThresholds = DEFAULT_COLOR_THRESHOLDS,
+                    bits: int = DEFAULT_LUT_BITS) -> np.ndarray:
+    """Lane paint mask for every quantized BGR color, cached per parameters.
+
+    Entry ``(b >> s) << 2 * bits | (g >> s) << bits | r >> s``, with
+    ``s = 8 - bits``, is 255 when the centre of that color cell falls within
+    the white or yellow HLS ranges and 0 otherwise.
+    """
+    levels = 1 << bits
+    shift = 8 - bits
+    centres = (np.arange(levels, dtype=np.uint16) << shift) + (
+        (1 << shift) >> 1)
+
+    blue, green, red = np.meshgrid(centres, centres, centres, indexing="ij")
+    colors = np.stack([blue, green, red], axis=-1).astype(np.uint8)
+    hls = cv2.cvtColor(colors.reshape(1, -1, 3), cv2.COLOR_BGR2HLS)[0]
+
+    hue, lightness, saturation = hls.T
+    white = (_in_range(lightness, thresholds.white_lightness)
+             & _in_range(saturation, thresholds.white_saturation))
+    yellow = (_in_range(hue, thresholds.yellow_hue)
+              & _in_range(lightness, thresholds.yellow_lightness)
+              & _in_range(saturation, thresholds.yellow_saturation))
+
+    lut = np.where(white | yellow, 255, 0).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+def _in_range(values: np.ndarray, bounds: tuple[int, int]) -> np.ndarray:
+    return (values >= bounds[0]) & (values <= bounds[1])
+
+
+def segment_lane_colors(
+        img: ImageType,
+        thresholds: LaneColorThresholds = DEFAULT_COLOR_THRESHOLDS,
+        bits: int = DEFAULT_LUT_BITS) -> ImageType:
+    """Mask the white and yellow lane paint of a BGR image."""
+    if img.ndim != 3 or img.shape[2] != 3 or img.dtype != np.uint8:
+        raise ValueError("Input image must be a 3-channel (BGR) uint8 image.")
+
+    validate_color_thresholds(thresholds)
+    validate_lut_bits(bits)
+
+    return _segment_lane_colors(img, build_color_lut(thresholds, bits), bits)
+
+
+def _segment_lane_colors(img: ImageType, lut: np.ndarray,
+                         bits: int) -> ImageType:
+    """Unchecked variant of segment_lane_colors with a prebuilt table."""
+    shift = 8 - bits
+    blue, green, red = cv2.split(img)
+
+    # Pack the quantized channels into one table index, in place; past
+    # 5 bits per channel the index no longer fits 16 bits
+    index = blue.astype(np.uint16 if 3 * bits <= 16 else np.uint32)
+    index >>= shift
+    index <<= bits
+    index |= green >> shift
+    index <<= bits
+    index |= red >> shift
+
+    return np.take(lut, index)
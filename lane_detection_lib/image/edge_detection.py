@@ -1,7 +1,14 @@
 # lane_detection/lane_detection_lib/image/edge_detection.py
 # Edge detection functions
 
-from ..common import cv2, np, ImageType
+from ..common import Enum, cv2, np, ImageType
+from .hough import detect_angle_restricted_lines
+
+
+class LineDetectorType(Enum):
+    """Enum for line detection backends."""
+    hough_p = 0
+    angle_restricted = 1
 
 
 def validate_threshold(threshold_lower: int, threshold_higher: int) -> None:
@@ -23,15 +30,44 @@ def apply_canny_edge_detection(img: ImageType, threshold_lower: int,
     return cv2.Canny(img, threshold_lower, threshold_higher)
 
 
-def detect_hough_lines(img: ImageType) -> ImageType:
-    # Parameters for the Hough Line Transform
+def validate_hough_settings(threshold: int, min_line_length: int,
+                            max_line_gap: int = 15) -> None:
+    """Validate the vote threshold and pixel lengths of Hough segments."""
+    if not isinstance(threshold, int) or threshold <= 0:
+        raise ValueError("Hough threshold must be a positive integer.")
+
+    if not isinstance(min_line_length, int) or min_line_length < 0:
+        raise ValueError(
+            "Minimum line length must be a non-negative integer.")
+
+    if not isinstance(max_line_gap, int) or max_line_gap < 0:
+        raise ValueError("Maximum line gap must be a non-negative integer.")
+
+
+def detect_hough_lines(img: ImageType, threshold: int = 30,
+                       min_line_length: int = 50,
+                       max_line_gap: int = 15) -> ImageType:
+    # Parameters for the Hough Line Transform; threshold is the minimum
+    # number of intersections, min_line_length and max_line_gap in pixels
     rho = 1  # Distance resolution in pixels
     theta = np.pi / 180  # Angular resolution in radians (1 degree)
-    threshold = 30  # Minimum number of intersections
-    min_line_length = 50  # Minimum length of a line (pixels)
-    max_line_gap = 15  # Maximum gap between lines (pixels)
 
     return cv2.HoughLinesP(
         img, rho, theta, threshold, np.array([]),
         minLineLength=min_line_length, maxLineGap=max_line_gap
     )
+
+
+def detect_lines(img: ImageType,
+                 detector: LineDetectorType = LineDetectorType.hough_p,
+                 **kwargs) -> ImageType:
+    """Detect line segments in an edge image with the selected backend."""
+    if detector == LineDetectorType.hough_p:
+        # Only the Hough settings apply, other names raise TypeError
+        return detect_hough_lines(img, **kwargs)
+
+    elif detector == LineDetectorType.angle_restricted:
+        return detect_angle_restricted_lines(img, **kwargs)
+
+    else:
+        raise ValueError(f"Unsupported line detector: {detector}")
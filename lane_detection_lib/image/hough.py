@@ -0,0 +1,255 @@
+# lane_detection/lane_detection_lib/image/hough.py
+# Angle-restricted Hough accumulator for lane lines
+
+from ..common import cv2, np, ImageType
+
+# Lane inclination windows in degrees, measured counter-clockwise from the
+# image x-axis as seen on screen (left lanes rise to the right).
+DEFAULT_LEFT_ANGLES = (22.0, 78.0)
+DEFAULT_RIGHT_ANGLES = (102.0, 158.0)
+
+# Number of edge pixels voted per chunk, bounds the (theta, point) buffer
+VOTE_CHUNK_SIZE = 65536
+
+# Bytes of the chunk buffers per voted (theta, point) pair: float32 rhos
+# and their temporary, int32 bins and the intp copy made by np.bincount.
+VOTE_BYTES_PER_PAIR = 20
+
+
+def validate_angle_window(angles: tuple[float, float]) -> None:
+    """Validate an inclination window given in degrees."""
+    if (not isinstance(angles, tuple) or len(angles) != 2
+            or not all(isinstance(a, (int, float)) for a in angles)):
+        raise ValueError("Angle window must be a tuple of two numbers.")
+
+    if not (0 <= angles[0] < angles[1] <= 180):
+        raise ValueError("Angle window must satisfy 0 <= low < high <= 180.")
+
+
+class _WindowVoter:
+    """Hough vote of one inclination window, fed points in any number of parts.
+
+    All points are first passed to ``vote``; after ``find_peak``, passing
+    them again, in the same order, to ``track`` collects the extent of the
+    peak's inliers. Memory is bounded by the accumulator, whatever the
+    number of points.
+    """
+
+    def __init__(self, angles: tuple[float, float], diagonal: float,
+                 angle_step: float, rho_step: float,
+                 chunk_bytes: int | None = None) -> None:
+        # Normal angle of a line with inclination alpha (y axis points
+        # down), pre-scaled so that truncation yields the rounded rho bin
+        self.line_angles = np.arange(angles[0], angles[1] + 1e-9, angle_step)
+        thetas = np.deg2rad(90.0 - self.line_angles)
+        self.cos_t = (np.cos(thetas) / rho_step).astype(np.float32)[:, None]
+        self.sin_t = (np.sin(thetas) / rho_step).astype(np.float32)[:, None]
+        self.rho_offset = np.float32(diagonal / rho_step + 0.5)
+
+        n_rho = int(np.ceil(2 * diagonal / rho_step)) + 2
+        self.accumulator = np.zeros((len(thetas), n_rho), dtype=np.int32)
+        # Points voted at once, VOTE_CHUNK_SIZE unless bounded in bytes
+        self.chunk_size = VOTE_CHUNK_SIZE if chunk_bytes is None else max(
+            chunk_bytes // (len(thetas) * VOTE_BYTES_PER_PAIR), 1)
+
+        self.n_points = 0
+        self.peak: tuple[int, int] | None = None
+        self.inliers = 0
+        self._first = self._last = None  # (position, x, y) along the line
+
+    @property
+    def nbytes(self) -> int:
+        """Accumulator plus the largest chunk buffers."""
+        return self.accumulator.nbytes + (
+            self.chunk_size * len(self.line_angles) * VOTE_BYTES_PER_PAIR)
+
+    def vote(self, x_coords: np.ndarray, y_coords: np.ndarray) -> None:
+        """Add the votes of some points to the accumulator."""
+        self.n_points += len(x_coords)
+        xs = x_coords.astype(np.float32)
+        ys = y_coords.astype(np.float32)
+
+        # Vote all (theta, point) pairs at once, chunked to bound memory
+        n_rho = self.accumulator.shape[1]
+        for start in range(0, len(xs), self.chunk_size):
+            rhos = self.cos_t * xs[start:start + self.chunk_size]
+            rhos += self.sin_t * ys[start:start + self.chunk_size]
+            rhos += self.rho_offset
+            rho_bins = rhos.astype(np.int32)
+            for row, bins in zip(self.accumulator, rho_bins):
+                row += np.bincount(bins, minlength=n_rho)
+
+    def find_peak(self, threshold: int) -> None:
+        """Pick the strongest bin once every point has voted."""
+        self.peak = None
+        if self.n_points < 2:
+            return
+
+        peak = int(self.accumulator.argmax())
+        theta_idx, rho_idx = divmod(peak, self.accumulator.shape[1])
+        if self.accumulator[theta_idx, rho_idx] >= threshold:
+            self.peak = theta_idx, rho_idx
+
+    def track(self, x_coords: np.ndarray, y_coords: np.ndarray) -> None:
+        """Extend the peak's segment with the inliers among some points."""
+        if self.peak is None:
+            return
+        theta_idx, rho_idx = self.peak
+
+        # Pixels that voted for the peak (one bin of tolerance)
+        xs = x_coords.astype(np.float32)
+        ys = y_coords.astype(np.float32)
+        rho_bins = (self.cos_t[theta_idx] * xs + self.sin_t[theta_idx] * ys
+                    + self.rho_offset).astype(np.int32)
+        inliers = np.flatnonzero(np.abs(rho_bins - rho_idx) <= 1)
+        if not len(inliers):
+            return
+        self.inliers += len(inliers)
+
+        # Extent along the line direction, ties going to the earliest point
+        alpha = np.deg2rad(self.line_angles[theta_idx])
+        positions = xs[inliers] * np.cos(alpha) - ys[inliers] * np.sin(alpha)
+        first, last = int(positions.argmin()), int(positions.argmax())
+
+        if self._first is None or positions[first] < self._first[0]:
+            point = inliers[first]
+            self._first = (positions[first], int(x_coords[point]),
+                           int(y_coords[point]))
+        if self._last is None or positions[last] > self._last[0]:
+            point = inliers[last]
+            self._last = (positions[last], int(x_coords[point]),
+                          int(y_coords[point]))
+
+    def segment(self, min_line_length: int) -> tuple[int, ...] | None:
+        """The tracked segment, or None if it is missing or too short."""
+        if self.peak is None or self.inliers < 2:
+            return None
+
+        (_, x1, y1), (_, x2, y2) = self._first, self._last
+        if np.hypot(x2 - x1, y2 - y1) < min_line_length:
+            return None
+
+        return x1, y1, x2, y2
+
+
+class _LaneVoter:
+    """Left and right window voters, splitting points at the frame center."""
+
+    def __init__(self, height: int, width: int,
+                 left_angles: tuple[float, float],
+                 right_angles: tuple[float, float], angle_step: float,
+                 rho_step: float, chunk_bytes: int | None = None) -> None:
+        diagonal = float(np.hypot(height, width))
+        self.center_x = width // 2
+        self.windows = tuple(
+            _WindowVoter(angles, diagonal, angle_step, rho_step, chunk_bytes)
+            for angles in (left_angles, right_angles))
+
+    @property
+    def nbytes(self) -> int:
+        """Accumulators plus the largest chunk buffers."""
+        return (sum(window.accumulator.nbytes for window in self.windows)
+                + max(window.nbytes - window.accumulator.nbytes
+                      for window in self.windows))
+
+    def _split(self, x_coords: np.ndarray, y_coords: np.ndarray):
+        for window, side in zip(self.windows, (x_coords < self.center_x,
+                                               x_coords > self.center_x)):
+            yield window, x_coords[side], y_coords[side]
+
+    def vote(self, x_coords: np.ndarray, y_coords: np.ndarray) -> None:
+        for window, xs, ys in self._split(x_coords, y_coords):
+            window.vote(xs, ys)
+
+    def find_peaks(self, threshold: int) -> None:
+        for window in self.windows:
+            window.find_peak(threshold)
+
+    def track(self, x_coords: np.ndarray, y_coords: np.ndarray) -> None:
+        for window, xs, ys in self._split(x_coords, y_coords):
+            window.track(xs, ys)
+
+    def segments(self, min_line_length: int) -> np.ndarray | None:
+        """Segments in the cv2.HoughLinesP layout, (N, 1, 4) or None."""
+        segments = [[segment] for window in self.windows
+                    if (segment := window.segment(min_line_length))
+                    is not None]
+        if not segments:
+            return None
+        return np.array(segments, dtype=np.int32)
+
+
+def vote_dominant_segment(x_coords: np.ndarray, y_coords: np.ndarray,
+                          angles: tuple[float, float], diagonal: float,
+                          angle_step: float = 1.0, rho_step: float = 1.0,
+                          threshold: int = 30,
+                          min_line_length: int = 50) -> tuple[int, ...] | None:
+    """Return the strongest segment whose inclination lies in the window."""
+    voter = _WindowVoter(angles, diagonal, angle_step, rho_step)
+    voter.vote(x_coords, y_coords)
+    voter.find_peak(threshold)
+    voter.track(x_coords, y_coords)
+    return voter.segment(min_line_length)
+
+
+def detect_lane_segments(
+        x_coords: np.ndarray, y_coords: np.ndarray, height: int, width: int,
+        left_angles: tuple[float, float] = DEFAULT_LEFT_ANGLES,
+        right_angles: tuple[float, float] = DEFAULT_RIGHT_ANGLES,
+        angle_step: float = 1.0, rho_step: float = 1.0,
+        threshold: int = 30, min_line_length: int = 50) -> np.ndarray | None:
+    """Vote edge pixel coordinates into the left and right lane windows."""
+    validate_angle_window(left_angles)
+    validate_angle_window(right_angles)
+
+    return _detect_lane_segments(
+        x_coords, y_coords, height, width, left_angles, right_angles,
+        angle_step, rho_step, threshold, min_line_length)
+
+
+def _detect_lane_segments(
+        x_coords: np.ndarray, y_coords: np.ndarray, height: int, width: int,
+        left_angles: tuple[float, float], right_angles: tuple[float, float],
+        angle_step: float, rho_step: float, threshold: int,
+        min_line_length: int) -> np.ndarray | None:
+    """Unchecked variant of detect_lane_segments."""
+    voter = _LaneVoter(height, width, left_angles, right_angles, angle_step,
+                       rho_step)
+    voter.vote(x_coords, y_coords)
+    voter.find_peaks(threshold)
+    voter.track(x_coords, y_coords)
+    return voter.segments(min_line_length)
+
+
+def detect_angle_restricted_lines(
+        img: ImageType,
+        left_angles: tuple[float, float] = DEFAULT_LEFT_ANGLES,
+        right_angles: tuple[float, float] = DEFAULT_RIGHT_ANGLES,
+        angle_step: float = 1.0, rho_step: float = 1.0,
+        threshold: int = 30, min_line_length: int = 50) -> np.ndarray | None:
+    """Detect the dominant left and right lane segments of an edge image."""
+    validate_angle_window(left_angles)
+    validate_angle_window(right_angles)
+
+    return _detect_angle_restricted_lines(
+        img, left_angles, right_angles, angle_step, rho_step, threshold,
+        min_line_length)
+
+
+def _detect_angle_restricted_lines(
+        img: ImageType, left_angles: tuple[float, float],
+        right_angles: tuple[float, float], angle_step: float,
+        rho_step: float, threshold: int,
+        min_line_length: int) -> np.ndarray | None:
+    """Unchecked variant of detect_angle_restricted_lines."""
+    height, width = img.shape[:2]
+
+    # Same coordinates as np.nonzero, without the per-axis index arrays
+    points = cv2.findNonZero(img)
+    if points is None:
+        return None
+    x_coords, y_coords = points[:, 0, 0], points[:, 0, 1]
+
+    return _detect_lane_segments(
+        x_coords, y_coords, height, width, left_angles, right_angles,
+        angle_step, rho_step, threshold, min_line_length)
@@ -43,6 +43,28 @@ def load_image(img_path: str) -> ImageType:
     return image
 
 
+def _read_image(img_path: str) -> ImageType:
+    """Load an image without path or content validation."""
+    image = cv2.imread(img_path)
+
+    # imread returns None for missing or unreadable files
+    if image is None:
+        raise FileNotFoundError(f"Could not load image at {img_path}")
+
+    return image
+
+
+def _decode_image(data: bytes, source: str) -> ImageType:
+    """Decode an encoded image held in memory without validation."""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8),
+                         cv2.IMREAD_COLOR)
+
+    if image is None:
+        raise ValueError(f"Could not decode image from {source}")
+
+    return image
+
+
 def display_image_cv2(img: ImageType, window_name: str = "Image") -> None:
     """Display the image using cv2."""
     cv2.namedWindow(window_name, cv2.WINDOW_KEEPRATIO)
@@ -64,6 +86,11 @@ def save_image(image: ImageType, output_path: str) -> bool:
     """Save an image to a file path."""
     validate_image(image, output_path)
 
+    return _write_image(image, output_path)
+
+
+def _write_image(image: ImageType, output_path: str) -> bool:
+    """Save an image to a file path without validating it."""
     # Ensure the output directory exists
     output_file = Path(output_path)
     output_file.parent.mkdir(parents=True, exist_ok=True)
@@ -37,13 +37,24 @@ def apply_roi_triangular(image: ImageType,
     """Apply a triangular ROI mask to the image."""
     height, width = get_image_dimensions(image)
 
+    return _triangular_mask(height, width, color)
+
+
+def _triangular_vertices(height: int, width: int) -> np.ndarray:
+    """Vertices of the triangular ROI, shaped (1, 3, 2) for cv2.fillPoly."""
     # Define the triangular region vertices
-    vertices = np.array([[
+    return np.array([[
         (int(width * 0.05), height),  # Bottom-left corner
         (int(width * 0.95), height),  # Bottom-right corner
         (int(width * 0.5), int(height * 0.6))  # Top-center
     ]], dtype=np.int32)
 
+
+def _triangular_mask(height: int, width: int,
+                     color: MaskColor = MaskColor.white) -> ImageType:
+    """Build the triangular ROI mask for a frame of the given size."""
+    vertices = _triangular_vertices(height, width)
+
     # Ensure vertices array has the correct shape
     if (len(vertices.shape) != 3 or vertices.shape[1] < 3 or
             vertices.shape[2] != 2):
@@ -0,0 +1,258 @@
+# lane_detection/lane_detection_lib/route_processing/archive.py
+# Streaming ingestion of frames from tar and zip archives
+
+import tarfile
+import threading
+import zipfile
+from pathlib import PurePosixPath
+from queue import Empty, Queue
+from typing import Iterator, NamedTuple, Optional, TypeVar
+
+from lane_detection_lib.common import Path, logging, cv2, ImageType
+from lane_detection_lib.image.io import _decode_image, _write_image
+from lane_detection_lib.route_processing.cache import (
+    hash_pipeline, ResultCache, _process_data_cached)
+from lane_detection_lib.route_processing.frame_skip import FrameSkipper
+from lane_detection_lib.route_processing.incremental import IMAGE_EXTENSIONS
+from lane_detection_lib.route_processing.pipeline import (
+    LanePipeline, LaneResult)
+
+# Block size of the sequential archive reads
+READ_BUFFER_SIZE = 4 << 20
+
+T = TypeVar("T")
+
+
+class ArchiveMember(NamedTuple):
+    """An image member of an archive, still encoded."""
+    index: int  # Position among the image members of the archive
+    name: str
+    data: bytes
+
+
+class ArchiveFrame(NamedTuple):
+    """A decoded image member of an archive."""
+    index: int
+    name: str
+    image: ImageType
+
+
+class ArchiveSummary(NamedTuple):
+    """Counts of what an archive run did."""
+    processed: int
+    cached: int
+    failed: int
+
+
+def validate_shard(shard_index: int, shard_count: int) -> None:
+    """Validate a worker's shard of the archive members."""
+    if not isinstance(shard_count, int) or shard_count <= 0:
+        raise ValueError("shard_count must be a positive integer.")
+
+    if not isinstance(shard_index, int) or not 0 <= shard_index < shard_count:
+        raise ValueError("shard_index must be an integer in [0, shard_count).")
+
+
+def _is_image_name(name: str) -> bool:
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def _iter_tar_members(archive_path: Path, shard_index: int,
+                      shard_count: int) -> Iterator[ArchiveMember]:
+    # Stream mode reads the archive front to back, in large blocks, and
+    # handles any compression without seeking.
+    with tarfile.open(archive_path, mode="r|*",
+                      bufsize=READ_BUFFER_SIZE) as archive:
+        index = 0
+        for member in archive:
+            if not member.isfile() or not _is_image_name(member.name):
+                continue
+
+            if index % shard_count == shard_index:
+                yield ArchiveMember(index, member.name,
+                                    archive.extractfile(member).read())
+            index += 1
+
+
+def _iter_zip_members(archive_path: Path, shard_index: int,
+                      shard_count: int) -> Iterator[ArchiveMember]:
+    with open(archive_path, "rb", buffering=READ_BUFFER_SIZE) as stream, \
+            zipfile.ZipFile(stream) as archive:
+        # Member data in file order, so reads only move forward
+        members = sorted(
+            (info for info in archive.infolist()
+             if not info.is_dir() and _is_image_name(info.filename)),
+            key=lambda info: info.header_offset)
+
+        for index in range(shard_index, len(members), shard_count):
+            info = members[index]
+            yield ArchiveMember(index, info.filename, archive.read(info))
+
+
+def iter_archive_members(archive_path: str | Path, shard_index: int = 0,
+                         shard_count: int = 1) -> Iterator[ArchiveMember]:
+    """Iterate the encoded image members of a tar or zip archive.
+
+    Nothing is extracted to disk. Members are numbered in archive order
+    (offset order for zip), and only those whose index modulo
+    ``shard_count`` equals ``shard_index`` are read, so ``shard_count``
+    workers can split one archive between them.
+    """
+    archive_path = Path(archive_path)
+    if not archive_path.is_file():
+        raise FileNotFoundError(f"Archive '{archive_path}' not found.")
+
+    validate_shard(shard_index, shard_count)
+
+    if zipfile.is_zipfile(archive_path):
+        return _iter_zip_members(archive_path, shard_index, shard_count)
+
+    if tarfile.is_tarfile(archive_path):
+        return _iter_tar_members(archive_path, shard_index, shard_count)
+
+    raise ValueError(f"Unsupported archive format: {archive_path}")
+
+
+def _read_ahead(items: Iterator[T], depth: int) -> Iterator[T]:
+    """Consume an iterator in a background thread, up to depth items ahead."""
+    if not isinstance(depth, int) or depth <= 0:
+        raise ValueError("read_ahead must be a positive integer.")
+
+    buffer: Queue = Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def produce() -> None:
+        try:
+            for item in items:
+                buffer.put((True, item))
+                if stop.is_set():
+                    return
+            buffer.put((False, None))
+        except Exception as e:
+            buffer.put((False, e))
+        finally:
+            items.close()
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            has_item, item = buffer.get()
+            if not has_item:
+                if item is not None:
+                    raise item
+                return
+            yield item
+    finally:
+        # Unblock a producer waiting on a full buffer, then let it finish
+        stop.set()
+        while thread.is_alive():
+            try:
+                buffer.get(timeout=0.05)
+            except Empty:
+                pass
+
+
+def _decode_members(archive_path: Path, members: Iterator[ArchiveMember]
+                    ) -> Iterator[ArchiveFrame]:
+    """Decode members, logging and skipping those that are not images."""
+    for member in members:
+        try:
+            image = _decode_image(member.data, f"{archive_path}:{member.name}")
+        except ValueError as e:
+            logging.error(e)
+            continue
+        yield ArchiveFrame(member.index, member.name, image)
+
+
+def iter_archive_frames(archive_path: str | Path, shard_index: int = 0,
+                        shard_count: int = 1,
+                        read_ahead: int = 8) -> Iterator[ArchiveFrame]:
+    """Iterate the decoded frames of an archive, in archive order.
+
+    Members are read and decoded in a background thread, up to
+    ``read_ahead`` frames ahead of the consumer.
+    """
+    members = iter_archive_members(archive_path, shard_index, shard_count)
+    return _read_ahead(_decode_members(Path(archive_path), members),
+                       read_ahead)
+
+
+def iter_archive_lanes(archive_path: str | Path,
+                       detector: LanePipeline | FrameSkipper,
+                       render: bool = False, shard_index: int = 0,
+                       shard_count: int = 1, read_ahead: int = 8
+                       ) -> Iterator[tuple[ArchiveFrame, LaneResult]]:
+    """Detect lanes on the frames of an archive as they are decoded.
+
+    With a FrameSkipper, near-duplicate consecutive members reuse the last
+    result; sharding makes a worker's frames non-consecutive, so it is best
+    used with a single shard.
+    """
+    for frame in iter_archive_frames(archive_path, shard_index, shard_count,
+                                     read_ahead):
+        yield frame, detector.process(frame.image, render)
+
+
+def _member_output_path(output_dir: Path, name: str) -> Path:
+    """Output path of a member, refusing names that escape the directory."""
+    member_path = PurePosixPath(name)
+    if member_path.is_absolute() or ".." in member_path.parts:
+        raise ValueError(f"Unsafe archive member name: {name}")
+
+    return output_dir.joinpath(*member_path.parts)
+
+
+def process_archive(archive_path: str | Path, pipeline: LanePipeline,
+                    output_dir: Optional[str | Path] = None,
+                    cache: Optional[ResultCache] = None,
+                    shard_index: int = 0, shard_count: int = 1,
+                    read_ahead: int = 8) -> ArchiveSummary:
+    """Process the image members of an archive without extracting it.
+
+    Rendered frames are written below ``output_dir`` under their member
+    names when it is given. With a cache, members are looked up by content
+    before being decoded, like ``process_route_cached``. Members that fail
+    are logged and counted.
+    """
+    archive_path = Path(archive_path)
+    output_dir = Path(output_dir) if output_dir is not None else None
+    need_image = output_dir is not None
+    params_hash = hash_pipeline(pipeline) if cache is not None else None
+    processed = cached = failed = 0
+
+    members = _read_ahead(
+        iter_archive_members(archive_path, shard_index, shard_count),
+        read_ahead)
+
+    for member in members:
+        source = f"{archive_path}:{member.name}"
+        try:
+            # Refuse unsafe names before spending any work on the member
+            output_path = (_member_output_path(output_dir, member.name)
+                           if output_dir is not None else None)
+
+            if cache is not None:
+                result, hit = _process_data_cached(
+                    member.data, source, pipeline, cache, params_hash,
+                    need_image, need_image)
+            else:
+                result = pipeline.process(
+                    _decode_image(member.data, source), render=need_image)
+                hit = False
+
+            if output_path is not None:
+                if not _write_image(result.image, str(output_path)):
+                    raise OSError(f"Failed to write {output_path}")
+        except (OSError, ValueError, cv2.error) as e:
+            logging.error(f"Failed to process {source}: {e}")
+            failed += 1
+            continue
+
+        if hit:
+            cached += 1
+        else:
+            processed += 1
+
+    return ArchiveSummary(processed, cached, failed)
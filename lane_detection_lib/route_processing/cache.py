@@ -0,0 +1,310 @@
+# lane_detection/lane_detection_lib/route_processing/cache.py
+# Content-addressed cache of lane detection results
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from lane_detection_lib import __version__
+from lane_detection_lib.common import Path, logging, cv2, np, ImageType
+from lane_detection_lib.image.io import _decode_image, _write_image
+from lane_detection_lib.route_processing.pipeline import (
+    LanePipeline, LaneResult)
+
+# Read size used when hashing input files
+HASH_CHUNK_SIZE = 1 << 20
+
+# Age in seconds after which a temporary file is left over by a killed
+# job rather than still being written by a live one
+STALE_TEMP_AGE = 3600
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the SHA-256 hex digest of a byte string."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(file_path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_pipeline(pipeline: LanePipeline) -> str:
+    """Hash the pipeline parameters together with the library version."""
+    params = dict(pipeline.params(), version=__version__)
+    return hash_bytes(json.dumps(params, sort_keys=True).encode())
+
+
+def make_cache_key(content_hash: str, params_hash: str) -> str:
+    """Combine an input content hash and a parameter hash into a key."""
+    return hash_bytes(f"{content_hash}:{params_hash}".encode())
+
+
+class ResultCache:
+    """Two-tier (memory LRU, size-capped disk) cache of lane results.
+
+    The memory tier holds at most ``memory_items`` entries whose rendered
+    images total at most ``memory_max_bytes``; an image larger than that
+    cap is left to the disk tier. Disk entries are a JSON file with the
+    lane geometry and, optionally, a lossless PNG of the rendered image.
+    Files are written atomically, so a cache directory can be shared
+    between concurrent jobs; least recently used entries are evicted once
+    the directory exceeds ``disk_max_bytes``. Temporary files left behind
+    by killed jobs are removed when the directory is scanned.
+    """
+
+    def __init__(self, memory_items: int = 256,
+                 memory_max_bytes: int = 256 << 20,
+                 disk_dir: Optional[str | Path] = None,
+                 disk_max_bytes: int = 1 << 30) -> None:
+        if not isinstance(memory_items, int) or memory_items < 0:
+            raise ValueError("memory_items must be a non-negative integer.")
+
+        if not isinstance(memory_max_bytes, int) or memory_max_bytes < 0:
+            raise ValueError(
+                "memory_max_bytes must be a non-negative integer.")
+
+        if not isinstance(disk_max_bytes, int) or disk_max_bytes <= 0:
+            raise ValueError("disk_max_bytes must be a positive integer.")
+
+        self.memory_items = memory_items
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir is not None else None
+
+        self._memory: OrderedDict[str, LaneResult] = OrderedDict()
+        self._memory_bytes = 0  # Image bytes held by the memory tier
+        self._lock = threading.Lock()
+
+        # key -> (last use, bytes on disk) for every disk entry
+        self._disk_index: dict[str, tuple[float, int]] = {}
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._scan_disk()
+
+    # ----------------- Memory tier -----------------
+
+    def _memory_get(self, key: str) -> Optional[LaneResult]:
+        result = self._memory.get(key)
+        if result is not None:
+            self._memory.move_to_end(key)
+        return result
+
+    def _memory_put(self, key: str, result: LaneResult) -> None:
+        if self.memory_items == 0:
+            return
+
+        # Too large to keep in memory, only the geometry is kept
+        if _image_nbytes(result) > self.memory_max_bytes:
+            result = result._replace(image=None)
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= _image_nbytes(previous)
+
+        self._memory[key] = result
+        self._memory_bytes += _image_nbytes(result)
+
+        while (len(self._memory) > self.memory_items
+               or self._memory_bytes > self.memory_max_bytes):
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _image_nbytes(evicted)
+
+    # ----------------- Disk tier -----------------
+
+    def _entry_paths(self, key: str) -> tuple[Path, Path]:
+        folder = self.disk_dir / key[:2]
+        return folder / f"{key}.json", folder / f"{key}.png"
+
+    def _scan_disk(self) -> None:
+        stale = time.time() - STALE_TEMP_AGE
+        for tmp_path in self.disk_dir.glob("*/.*.tmp"):
+            try:
+                if tmp_path.stat().st_mtime < stale:
+                    tmp_path.unlink()
+            except OSError:
+                continue
+
+        for meta_path in self.disk_dir.glob("*/*.json"):
+            image_path = meta_path.with_suffix(".png")
+            try:
+                stat = meta_path.stat()
+                size = stat.st_size
+                if image_path.is_file():
+                    size += image_path.stat().st_size
+            except OSError:
+                continue
+            self._disk_index[meta_path.stem] = (stat.st_mtime, size)
+
+    def _disk_get(self, key: str,
+                  need_image: bool) -> Optional[LaneResult]:
+        meta_path, image_path = self._entry_paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            if need_image and not meta["has_image"]:
+                return None
+            image = None
+            if meta["has_image"] and need_image:
+                image = cv2.imdecode(
+                    np.fromfile(image_path, dtype=np.uint8),
+                    cv2.IMREAD_UNCHANGED)
+                if image is None:
+                    return None
+            # Mark as recently used for eviction by other processes too
+            os.utime(meta_path)
+
+            # Entries written by other processes join the local index
+            size = self._disk_index.get(key, (0, None))[1]
+            if size is None:
+                size = meta_path.stat().st_size
+                if meta["has_image"]:
+                    size += image_path.stat().st_size
+        except (OSError, ValueError, KeyError):
+            return None
+
+        self._disk_index[key] = (time.time(), size)
+
+        left_line, right_line = meta["left_line"], meta["right_line"]
+        return LaneResult(tuple(left_line) if left_line else None,
+                          tuple(right_line) if right_line else None, image)
+
+    def _disk_put(self, key: str, result: LaneResult,
+                  store_image: bool) -> None:
+        meta_path, image_path = self._entry_paths(key)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+
+        has_image = store_image and result.image is not None
+        size = 0
+        if has_image:
+            success, encoded = cv2.imencode(".png", result.image)
+            if not success:
+                logging.warning(f"Failed to encode cached image for {key}")
+                has_image = False
+            else:
+                _atomic_write(image_path, encoded.tobytes())
+                size += encoded.size
+
+        meta = json.dumps({
+            "left_line": result.left_line,
+            "right_line": result.right_line,
+            "has_image": has_image,
+        }).encode()
+        _atomic_write(meta_path, meta)
+        size += len(meta)
+
+        self._disk_index[key] = (time.time(), size)
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        total = sum(size for _, size in self._disk_index.values())
+        if total <= self.disk_max_bytes:
+            return
+
+        for key, (_, size) in sorted(self._disk_index.items(),
+                                     key=lambda item: item[1][0]):
+            meta_path, image_path = self._entry_paths(key)
+            meta_path.unlink(missing_ok=True)
+            image_path.unlink(missing_ok=True)
+            del self._disk_index[key]
+            total -= size
+            if total <= self.disk_max_bytes:
+                break
+
+    # ----------------- Public API -----------------
+
+    def get(self, key: str, need_image: bool = False
+            ) -> Optional[LaneResult]:
+        """Look a key up in memory, then on disk; None on a miss."""
+        with self._lock:
+            result = self._memory_get(key)
+            if result is not None and (
+                    not need_image or result.image is not None):
+                return result
+
+            if self.disk_dir is None:
+                return None
+
+            result = self._disk_get(key, need_image)
+            if result is not None:
+                self._memory_put(key, result)
+            return result
+
+    def put(self, key: str, result: LaneResult,
+            store_image: bool = True) -> None:
+        """Store a result in both tiers."""
+        if not store_image:
+            result = result._replace(image=None)
+
+        with self._lock:
+            self._memory_put(key, result)
+            if self.disk_dir is not None:
+                self._disk_put(key, result, store_image)
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory tier, keeping disk entries."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+
+def _image_nbytes(result: LaneResult) -> int:
+    return result.image.nbytes if result.image is not None else 0
+
+
+def _atomic_write(file_path: Path, data: bytes) -> None:
+    """Write a file through a temporary name and an atomic rename."""
+    tmp_path = file_path.with_name(
+        f".{file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, file_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def _process_data_cached(data: bytes, source: str, pipeline: LanePipeline,
+                         cache: ResultCache, params_hash: str,
+                         need_image: bool, store_image: bool
+                         ) -> tuple[LaneResult, bool]:
+    """Process encoded image bytes through the cache, flagging hits."""
+    key = make_cache_key(hash_bytes(data), params_hash)
+
+    result = cache.get(key, need_image)
+    if result is not None:
+        return result, True
+
+    image: ImageType = _decode_image(data, source)
+    result = pipeline.process(image, render=need_image)
+    cache.put(key, result, store_image)
+    return result, False
+
+
+def process_route_cached(image_path: str | Path, pipeline: LanePipeline,
+                         cache: ResultCache,
+                         output_path: Optional[str] = None,
+                         store_image: bool = True) -> LaneResult:
+    """Process an image through the cache, skipping decode on a hit."""
+    image_path = Path(image_path)
+    if not image_path.is_file():
+        raise FileNotFoundError(
+            f"Image file '{image_path}' doesn't exist. Please check the path.")
+
+    need_image = store_image or output_path is not None
+    result, _ = _process_data_cached(
+        image_path.read_bytes(), str(image_path), pipeline, cache,
+        hash_pipeline(pipeline), need_image, store_image)
+
+    if output_path is not None and not _write_image(result.image,
+                                                    str(output_path)):
+        raise OSError(f"Failed to write {output_path}")
+
+    return result
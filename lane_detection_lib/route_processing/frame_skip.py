@@ -0,0 +1,140 @@
+# lane_detection/lane_detection_lib/route_processing/frame_skip.py
+# Reuse lane results across near-identical consecutive frames
+
+from typing import Optional
+
+from lane_detection_lib.common import cv2, ImageType
+from lane_detection_lib.image.roi import _triangular_mask, _triangular_vertices
+from lane_detection_lib.route_processing.pipeline import (
+    LanePipeline, LaneResult)
+
+# Source samples per thumbnail cell along each axis. Frames are strided
+# down to this density before the area resize, which keeps the cost of a
+# fingerprint independent of the frame size.
+SAMPLES_PER_CELL = 8
+
+
+class FrameSkipper:
+    """Skip the pipeline on frames that barely differ from the last one run.
+
+    Each frame is reduced to a tiny grayscale thumbnail, of the ROI only
+    when ``roi_only`` is set. When the mean absolute difference between the
+    thumbnail and the one of the last processed frame is at most
+    ``threshold`` gray levels, the lanes of that frame are reused, for at
+    most ``max_reuse`` frames in a row. Comparing against the last
+    processed frame, not the previous one, keeps slow drifts from adding up
+    unnoticed. Meant for a single stream of frames.
+    """
+
+    def __init__(self, pipeline: LanePipeline, threshold: float = 2.0,
+                 max_reuse: int = 30,
+                 thumbnail_size: tuple[int, int] = (32, 32),
+                 roi_only: bool = True) -> None:
+        if not isinstance(threshold, (int, float)) or threshold < 0:
+            raise ValueError("threshold must be a non-negative number.")
+
+        if not isinstance(max_reuse, int) or max_reuse < 0:
+            raise ValueError("max_reuse must be a non-negative integer.")
+
+        if (not isinstance(thumbnail_size, tuple) or len(thumbnail_size) != 2
+                or not all(isinstance(side, int) and side > 0
+                           for side in thumbnail_size)):
+            raise ValueError(
+                "thumbnail_size must be a tuple of two positive integers.")
+
+        if not isinstance(roi_only, bool):
+            raise ValueError("roi_only must be a boolean value.")
+
+        self.pipeline = pipeline
+        self.threshold = threshold
+        self.max_reuse = max_reuse
+        self.thumbnail_size = thumbnail_size
+        self.roi_only = roi_only
+
+        self.processed = 0
+        self.skipped = 0
+
+        self._shape: Optional[tuple[int, ...]] = None
+        self._rows = slice(None)
+        self._steps = (1, 1)
+        self._mask: Optional[ImageType] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the last processed frame, so the next one is processed."""
+        self._reference: Optional[ImageType] = None
+        self._lanes: Optional[LaneResult] = None
+        self._age = 0
+
+    def _prepare(self, frame_shape: tuple[int, ...]) -> None:
+        """Precompute the sampling and ROI mask for a frame shape."""
+        height, width = frame_shape[:2]
+        thumb_width, thumb_height = self.thumbnail_size
+
+        # Only the rows spanned by the ROI matter when comparing the ROI
+        top = (int(_triangular_vertices(height, width)[..., 1].min())
+               if self.roi_only else 0)
+        self._rows = slice(top, height)
+
+        self._steps = (
+            max((height - top) // (thumb_height * SAMPLES_PER_CELL), 1),
+            max(width // (thumb_width * SAMPLES_PER_CELL), 1))
+
+        self._mask = None
+        if self.roi_only:
+            roi = _triangular_mask(height, width)[self._rows]
+            self._mask = cv2.threshold(
+                cv2.resize(roi, self.thumbnail_size,
+                           interpolation=cv2.INTER_AREA),
+                127, 255, cv2.THRESH_BINARY)[1]
+
+        self._shape = frame_shape
+        self.reset()
+
+    def fingerprint(self, image: ImageType) -> ImageType:
+        """Grayscale thumbnail summarizing a BGR frame."""
+        if image.shape != self._shape:
+            self._prepare(image.shape)
+
+        row_step, col_step = self._steps
+        sampled = image[self._rows][::row_step, ::col_step]
+        thumbnail = cv2.resize(sampled, self.thumbnail_size,
+                               interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(thumbnail, cv2.COLOR_BGR2GRAY)
+
+    def difference(self, first: ImageType, second: ImageType) -> float:
+        """Mean absolute gray level difference between two thumbnails."""
+        return cv2.mean(cv2.absdiff(first, second), self._mask)[0]
+
+    def process(self, image: ImageType, render: bool = True) -> LaneResult:
+        """Detect lanes on a frame, reusing the last result if unchanged."""
+        thumbnail = self.fingerprint(image)
+
+        if (self._reference is not None and self._age < self.max_reuse
+                and self.difference(thumbnail, self._reference)
+                <= self.threshold):
+            self._age += 1
+            self.skipped += 1
+
+            if not render:
+                return self._lanes
+
+            # The lanes are reused, the frame itself is still drawn
+            resized_image = cv2.resize(image, None, fx=self.pipeline.scale,
+                                       fy=self.pipeline.scale)
+            return self._lanes._replace(image=self.pipeline.render(
+                resized_image, self._lanes.left_line, self._lanes.right_line))
+
+        result = self.pipeline.process(image, render)
+        self._reference = thumbnail
+        self._lanes = result._replace(image=None)
+        self._age = 0
+        self.processed += 1
+
+        return result
+
+    @property
+    def skip_ratio(self) -> float:
+        """Fraction of the frames seen so far that reused a result."""
+        total = self.processed + self.skipped
+        return self.skipped / total if total else 0.0
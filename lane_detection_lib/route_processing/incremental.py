@@ -0,0 +1,182 @@
+# lane_detection/lane_detection_lib/route_processing/incremental.py
+# Incremental reprocessing of image directories
+
+import json
+import os
+from typing import NamedTuple, Optional
+
+from lane_detection_lib.common import Path, logging, cv2
+from lane_detection_lib.image.io import _decode_image, _write_image
+from lane_detection_lib.route_processing.cache import (
+    hash_bytes, hash_pipeline, _atomic_write)
+from lane_detection_lib.route_processing.pipeline import LanePipeline
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+MANIFEST_NAME = ".lane_manifest.json"
+MANIFEST_VERSION = 2  # Outputs are relative to the output directory
+
+
+class IncrementalSummary(NamedTuple):
+    """Counts of what an incremental run did."""
+    processed: int
+    skipped: int
+    removed: int
+    failed: int
+
+
+def scan_images(input_dir: Path,
+                exclude: tuple[Path, ...] = ()) -> dict[str, os.stat_result]:
+    """Stat every image below a directory, keyed by POSIX relative path.
+
+    Directories in ``exclude`` are not descended into.
+    """
+    excluded = {path.resolve() for path in exclude}
+    found = {}
+    pending = [input_dir]
+
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if Path(entry.path).resolve() not in excluded:
+                        pending.append(Path(entry.path))
+                elif (entry.is_file()
+                      and entry.name.lower().endswith(IMAGE_EXTENSIONS)):
+                    rel_path = Path(entry.path).relative_to(input_dir)
+                    found[rel_path.as_posix()] = entry.stat()
+
+    return found
+
+
+def load_manifest(manifest_path: Path) -> dict[str, dict]:
+    """Load manifest entries, or an empty manifest if none is usable."""
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except FileNotFoundError:
+        return {}
+    except ValueError:
+        logging.warning(f"Ignoring corrupt manifest at {manifest_path}")
+        return {}
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+
+    return manifest["entries"]
+
+
+def save_manifest(manifest_path: Path, entries: dict[str, dict]) -> None:
+    """Atomically replace the manifest with the given entries."""
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    data = json.dumps({"version": MANIFEST_VERSION, "entries": entries},
+                      indent=1, sort_keys=True)
+    _atomic_write(manifest_path, data.encode())
+
+
+def _is_up_to_date(entry: Optional[dict], params_hash: str,
+                   output_dir: Path) -> bool:
+    return (entry is not None and entry["params_hash"] == params_hash
+            and (output_dir / entry["output"]).is_file())
+
+
+def _remove_output(output_dir: Path, rel_path: str) -> None:
+    """Delete an output, then the directories it leaves empty."""
+    output_path = output_dir / rel_path
+    output_path.unlink(missing_ok=True)
+
+    for parent in output_path.relative_to(output_dir).parents[:-1]:
+        try:
+            (output_dir / parent).rmdir()
+        except OSError:  # Not empty, or already gone
+            break
+
+
+def process_directory_incremental(
+        input_dir: str | Path, output_dir: str | Path,
+        pipeline: LanePipeline, manifest_path: Optional[str | Path] = None,
+        checkpoint_every: int = 25) -> IncrementalSummary:
+    """Process only new or changed images of a directory tree.
+
+    Files whose size and mtime match the manifest are skipped without being
+    read; files whose stat changed are hashed, and reprocessed only if
+    their content or the pipeline parameters changed. Outputs of deleted
+    inputs are removed. The manifest is rewritten atomically every
+    ``checkpoint_every`` updated entries, so an interrupted run resumes
+    from its last checkpoint. Outputs are recorded relative to
+    ``output_dir``, so the manifest does not depend on the working
+    directory.
+    """
+    input_dir = Path(input_dir)
+    output_dir = Path(output_dir)
+
+    if not input_dir.is_dir():
+        raise NotADirectoryError(f"Input directory '{input_dir}' not found.")
+
+    if not isinstance(checkpoint_every, int) or checkpoint_every <= 0:
+        raise ValueError("checkpoint_every must be a positive integer.")
+
+    # Outputs would overwrite their own inputs
+    if input_dir.resolve() == output_dir.resolve():
+        raise ValueError("output_dir must differ from input_dir.")
+
+    manifest_path = Path(manifest_path) if manifest_path is not None \
+        else output_dir / MANIFEST_NAME
+
+    entries = load_manifest(manifest_path)
+    params_hash = hash_pipeline(pipeline)
+    # An output tree nested in the input tree is not input
+    current = scan_images(input_dir, exclude=(output_dir,))
+    processed = skipped = removed = failed = 0
+    pending_changes = 0
+
+    # Drop outputs whose input disappeared
+    for rel_path in sorted(set(entries) - set(current)):
+        _remove_output(output_dir, entries.pop(rel_path)["output"])
+        removed += 1
+
+    for rel_path, stat in sorted(current.items()):
+        entry = entries.get(rel_path)
+
+        # Fast path: unchanged stat, no need to read the file
+        if (_is_up_to_date(entry, params_hash, output_dir)
+                and entry["size"] == stat.st_size
+                and entry["mtime_ns"] == stat.st_mtime_ns):
+            skipped += 1
+            continue
+
+        input_path = input_dir / rel_path
+        output_path = output_dir / rel_path
+        try:
+            data = input_path.read_bytes()
+            content_hash = hash_bytes(data)
+
+            # Touched but identical content, only refresh the stat
+            if not (_is_up_to_date(entry, params_hash, output_dir)
+                    and entry["sha256"] == content_hash):
+                result = pipeline.process(
+                    _decode_image(data, str(input_path)))
+                if not _write_image(result.image, str(output_path)):
+                    raise OSError(f"Failed to write {output_path}")
+                processed += 1
+            else:
+                skipped += 1
+        except (OSError, ValueError, cv2.error) as e:
+            logging.error(f"Failed to process {input_path}: {e}")
+            failed += 1
+            continue
+
+        entries[rel_path] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": content_hash,
+            "params_hash": params_hash,
+            "output": rel_path,
+        }
+
+        pending_changes += 1
+        if pending_changes >= checkpoint_every:
+            save_manifest(manifest_path, entries)
+            pending_changes = 0
+
+    save_manifest(manifest_path, entries)
+
+    return IncrementalSummary(processed, skipped, removed, failed)
@@ -0,0 +1,306 @@
+# lane_detection/lane_detection_lib/route_processing/pipeline.py
+# Validated-once processing pipeline for many frames
+
+from functools import partial
+from typing import NamedTuple, Optional
+
+from lane_detection_lib.common import Path, cv2, np, ImageType
+from lane_detection_lib.draw.lines_detection import (
+    _separate_lines, _fit_detected_line, _draw_lane_lines,
+    _fit_line_points, render_lanes_inplace, RenderMode)
+from lane_detection_lib.draw.line_fitting import (
+    fit_lane_ransac, fit_lane_segments, FitMethod, LineFit)
+from lane_detection_lib.image.blur import validate_kernel_size
+from lane_detection_lib.image.color_segmentation import (
+    _segment_lane_colors, build_color_lut, validate_color_thresholds,
+    LaneCue, LaneColorThresholds, DEFAULT_COLOR_THRESHOLDS, DEFAULT_LUT_BITS)
+from lane_detection_lib.image.edge_detection import (
+    detect_hough_lines, validate_hough_settings, validate_threshold,
+    LineDetectorType)
+from lane_detection_lib.image.hough import (
+    _detect_angle_restricted_lines, validate_angle_window,
+    DEFAULT_LEFT_ANGLES, DEFAULT_RIGHT_ANGLES)
+from lane_detection_lib.image.io import _read_image, _write_image
+from lane_detection_lib.image.roi import _triangular_mask
+
+
+class LaneResult(NamedTuple):
+    """Lane geometry of a frame and, optionally, the rendered image."""
+    left_line: Optional[tuple[int, ...]]
+    right_line: Optional[tuple[int, ...]]
+    image: Optional[ImageType] = None
+
+
+class FrameGeometry(NamedTuple):
+    """Per-frame-shape state, computed once and reused for every frame."""
+    height: int
+    width: int
+    center_x: int
+    roi_mask: ImageType
+
+
+class LanePipeline:
+    """Lane detection pipeline that validates its inputs only once.
+
+    All parameters are checked at construction and the geometry of each
+    frame shape is checked the first time it is seen (or up front through
+    ``frame_shape``). ``process`` then runs the unchecked internal variants
+    of the library helpers, so it must only be given BGR uint8 frames.
+    """
+
+    def __init__(self, scale: float = 0.5,
+                 blur_kernel: tuple[int, int] = (5, 5),
+                 blur_deviation: int = 0,
+                 canny_lower: int = 50, canny_higher: int = 175,
+                 slope_threshold: float = 0.4,
+                 line_detector: LineDetectorType = LineDetectorType.hough_p,
+                 left_angles: tuple[float, float] = DEFAULT_LEFT_ANGLES,
+                 right_angles: tuple[float, float] = DEFAULT_RIGHT_ANGLES,
+                 render_mode: RenderMode = RenderMode.full_frame,
+                 rgb_output: bool = True,
+                 fit_method: FitMethod = FitMethod.polyfit,
+                 lane_cue: LaneCue = LaneCue.edges,
+                 color_thresholds: LaneColorThresholds = (
+                     DEFAULT_COLOR_THRESHOLDS),
+                 min_inlier_ratio: float = 0.0,
+                 hough_threshold: int = 30, min_line_length: int = 50,
+                 max_line_gap: int = 15,
+                 frame_shape: Optional[tuple[int, ...]] = None) -> None:
+        if not isinstance(scale, (int, float)) or scale <= 0:
+            raise ValueError("Scale must be a positive number.")
+
+        # GaussianBlur needs both kernel sides, which validate_kernel_size
+        # does not enforce
+        if not isinstance(blur_kernel, tuple) or len(blur_kernel) != 2:
+            raise ValueError(
+                "blur_kernel must be a tuple of two positive odd integers.")
+        validate_kernel_size(blur_kernel)
+        validate_threshold(canny_lower, canny_higher)
+
+        if not isinstance(blur_deviation, (int, float)) or blur_deviation < 0:
+            raise ValueError("Blur deviation must be a non-negative number.")
+
+        if (not isinstance(slope_threshold, (int, float))
+                or slope_threshold < 0):
+            raise ValueError("Slope threshold must be a non-negative number.")
+
+        if not isinstance(line_detector, LineDetectorType):
+            raise ValueError(
+                "line_detector must be an instance of LineDetectorType Enum.")
+
+        validate_angle_window(left_angles)
+        validate_angle_window(right_angles)
+
+        if not isinstance(render_mode, RenderMode):
+            raise ValueError(
+                "render_mode must be an instance of RenderMode Enum.")
+
+        if not isinstance(rgb_output, bool):
+            raise ValueError("rgb_output must be a boolean value.")
+
+        if not isinstance(fit_method, FitMethod):
+            raise ValueError(
+                "fit_method must be an instance of FitMethod Enum.")
+
+        if not isinstance(lane_cue, LaneCue):
+            raise ValueError("lane_cue must be an instance of LaneCue Enum.")
+
+        validate_color_thresholds(color_thresholds)
+
+        if (not isinstance(min_inlier_ratio, (int, float))
+                or not 0 <= min_inlier_ratio <= 1):
+            raise ValueError("min_inlier_ratio must be a number in [0, 1].")
+
+        validate_hough_settings(hough_threshold, min_line_length,
+                                max_line_gap)
+
+        self.scale = scale
+        self.blur_kernel = blur_kernel
+        self.blur_deviation = blur_deviation
+        self.canny_lower = canny_lower
+        self.canny_higher = canny_higher
+        self.slope_threshold = slope_threshold
+        self.line_detector = line_detector
+        self.left_angles = left_angles
+        self.right_angles = right_angles
+        self.render_mode = render_mode
+        self.rgb_output = rgb_output
+        self.fit_method = fit_method
+        self.lane_cue = lane_cue
+        self.color_thresholds = color_thresholds
+        self.min_inlier_ratio = min_inlier_ratio
+        self.hough_threshold = hough_threshold
+        self.min_line_length = min_line_length
+        self.max_line_gap = max_line_gap
+
+        # Bind the detection backend once
+        if line_detector == LineDetectorType.hough_p:
+            self._detect_lines = partial(
+                detect_hough_lines, threshold=hough_threshold,
+                min_line_length=min_line_length, max_line_gap=max_line_gap)
+        else:
+            self._detect_lines = partial(
+                _detect_angle_restricted_lines, left_angles=left_angles,
+                right_angles=right_angles, angle_step=1.0, rho_step=1.0,
+                threshold=hough_threshold, min_line_length=min_line_length)
+
+        # Color cues share one lookup table per threshold set
+        if lane_cue != LaneCue.edges:
+            self._color_lut = build_color_lut(color_thresholds,
+                                              DEFAULT_LUT_BITS)
+            # Canny marks the road side of paint borders too
+            self._paint_kernel = cv2.getStructuringElement(cv2.MORPH_RECT,
+                                                           (5, 5))
+
+        self._geometry: dict[tuple[int, ...], FrameGeometry] = {}
+        if frame_shape is not None:
+            self.prepare(frame_shape)
+
+    def params(self) -> dict:
+        """Return the pipeline parameters as plain, JSON-friendly values."""
+        return {
+            "scale": self.scale,
+            "blur_kernel": list(self.blur_kernel),
+            "blur_deviation": self.blur_deviation,
+            "canny_lower": self.canny_lower,
+            "canny_higher": self.canny_higher,
+            "slope_threshold": self.slope_threshold,
+            "line_detector": self.line_detector.name,
+            "left_angles": list(self.left_angles),
+            "right_angles": list(self.right_angles),
+            "render_mode": self.render_mode.name,
+            "rgb_output": self.rgb_output,
+            "fit_method": self.fit_method.name,
+            "lane_cue": self.lane_cue.name,
+            "color_thresholds": {
+                name: list(bounds)
+                for name, bounds in self.color_thresholds._asdict().items()},
+            "min_inlier_ratio": self.min_inlier_ratio,
+            "hough_threshold": self.hough_threshold,
+            "min_line_length": self.min_line_length,
+            "max_line_gap": self.max_line_gap,
+        }
+
+    def prepare(self, frame_shape: tuple[int, ...]) -> FrameGeometry:
+        """Validate a frame shape and precompute its resized geometry."""
+        if (not isinstance(frame_shape, tuple) or len(frame_shape) != 3
+                or frame_shape[2] != 3):
+            raise ValueError("Frame shape must be (height, width, 3).")
+
+        if not all(isinstance(x, (int, np.integer)) and x > 0
+                   for x in frame_shape):
+            raise ValueError("Frame dimensions must be positive integers.")
+
+        # Same rounding as cv2.resize with fx/fy
+        height = round(frame_shape[0] * self.scale)
+        width = round(frame_shape[1] * self.scale)
+        if height <= 0 or width <= 0:
+            raise ValueError("Scaled frame must be at least one pixel.")
+
+        geometry = FrameGeometry(height, width, width // 2,
+                                 _triangular_mask(height, width))
+        self._geometry[tuple(frame_shape)] = geometry
+
+        return geometry
+
+    def fit_points(self, x_coords: np.ndarray, y_coords: np.ndarray,
+                   height: int, width: int) -> Optional[tuple[int, ...]]:
+        """Fit a lane line x = f(y) through points with the fit method."""
+        if self.fit_method == FitMethod.ransac:
+            return self._accept_fit(
+                fit_lane_ransac(x_coords, y_coords, height))
+
+        return _fit_line_points(x_coords, y_coords, height, width)
+
+    def fit_lines(self, detected_lines: np.ndarray, height: int,
+                  width: int) -> Optional[tuple[int, ...]]:
+        """Fit a lane line to (N, 4) segments with the fit method."""
+        if self.fit_method == FitMethod.ransac:
+            return self._accept_fit(fit_lane_segments(detected_lines, height))
+
+        return _fit_detected_line(detected_lines, height, width)
+
+    def _accept_fit(self, fit: LineFit) -> Optional[tuple[int, ...]]:
+        """Line of a robust fit, None if it explains too few points."""
+        if fit.inlier_ratio < self.min_inlier_ratio:
+            return None
+        return fit.line
+
+    def _lane_cue_mask(self, resized_image: ImageType) -> ImageType:
+        """Binary mask of the lane cue pixels of a resized frame."""
+        if self.lane_cue == LaneCue.color:
+            return _segment_lane_colors(resized_image, self._color_lut,
+                                        DEFAULT_LUT_BITS)
+
+        gray_image = cv2.cvtColor(resized_image, cv2.COLOR_BGR2GRAY)
+        blurred_image = cv2.GaussianBlur(gray_image, self.blur_kernel,
+                                         self.blur_deviation)
+        edges = cv2.Canny(blurred_image, self.canny_lower, self.canny_higher)
+
+        if self.lane_cue == LaneCue.edges:
+            return edges
+
+        paint = _segment_lane_colors(resized_image, self._color_lut,
+                                     DEFAULT_LUT_BITS)
+        return cv2.bitwise_and(edges, cv2.dilate(paint, self._paint_kernel))
+
+    def detect(self, image: ImageType) -> tuple[LaneResult, ImageType]:
+        """Detect lanes on a frame, returning them with the resized frame."""
+        geometry = self._geometry.get(image.shape)
+        if geometry is None:
+            geometry = self.prepare(image.shape)
+
+        resized_image = cv2.resize(image, None, fx=self.scale, fy=self.scale)
+        cue = self._lane_cue_mask(resized_image)
+        masked_cue = cv2.bitwise_and(cue, geometry.roi_mask)
+
+        lines = self._detect_lines(masked_cue)
+        left_lines, right_lines = _separate_lines(
+            lines, geometry.center_x, self.slope_threshold)
+
+        left_line = self.fit_lines(left_lines, geometry.height,
+                                   geometry.width)
+        right_line = self.fit_lines(right_lines, geometry.height,
+                                    geometry.width)
+
+        return LaneResult(left_line, right_line), resized_image
+
+    def render(self, resized_image: ImageType,
+               left_line: Optional[tuple[int, ...]],
+               right_line: Optional[tuple[int, ...]]) -> ImageType:
+        """Overlay the lane lines on the resized frame.
+
+        With ``RenderMode.in_place`` the resized frame itself is drawn into,
+        so it must be a buffer the caller no longer needs.
+        """
+        if self.render_mode == RenderMode.in_place:
+            return render_lanes_inplace(resized_image, left_line, right_line,
+                                        to_rgb=self.rgb_output)
+
+        lane_image = _draw_lane_lines(np.zeros_like(resized_image),
+                                      left_line, right_line)
+        final_image = cv2.addWeighted(resized_image, 0.8, lane_image, 1, 1)
+
+        if not self.rgb_output:
+            return final_image
+        return cv2.cvtColor(final_image, cv2.COLOR_BGR2RGB)
+
+    def process(self, image: ImageType, render: bool = True) -> LaneResult:
+        """Run the whole pipeline on a BGR frame."""
+        lanes, resized_image = self.detect(image)
+
+        if not render:
+            return lanes
+
+        return lanes._replace(image=self.render(
+            resized_image, lanes.left_line, lanes.right_line))
+
+    def process_file(self, image_path: str | Path,
+                     output_path: Optional[str] = None) -> LaneResult:
+        """Load a frame from disk, process it and optionally save it."""
+        result = self.process(_read_image(str(image_path)))
+
+        if output_path is not None:
+            _write_image(result.image, str(output_path))
+
+        return result
@@ -6,13 +6,16 @@ from lane_detection_lib.draw.lines_detection import detect_and_draw_lanes
 
 from lane_detection_lib.image.blur import apply_gaussian_blur
 from lane_detection_lib.image.color_conversion import convert_to_rgb2grayscale
-from lane_detection_lib.image.edge_detection import apply_canny_edge_detection
+from lane_detection_lib.image.edge_detection import (
+    apply_canny_edge_detection, LineDetectorType)
 from lane_detection_lib.image.io import load_image, save_image
 from lane_detection_lib.image.resize import resize_by_factor
 from lane_detection_lib.image.roi import apply_roi_mask, MaskType
 
 
-def process_route(image_path: str, output_path: str = None) -> TypeAlias:
+def process_route(image_path: str, output_path: str = None,
+                  line_detector: LineDetectorType = LineDetectorType.hough_p
+                  ) -> TypeAlias:
     """Load, process, and display a route detection image."""
     image_file = Path(image_path)
 
@@ -35,7 +38,8 @@ def process_route(image_path: str, output_path: str = None) -> TypeAlias:
     # Apply the mask to the edges image
     masked_edges = cv2.bitwise_and(edges, roi_mask)
     # Detect and draw lines
-    final_image = detect_and_draw_lanes(resized_image, masked_edges)
+    final_image = detect_and_draw_lanes(resized_image, masked_edges,
+                                        line_detector)
 
     # Save image
     if output_path is not None:
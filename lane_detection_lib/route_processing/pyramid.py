@@ -0,0 +1,171 @@
+# lane_detection/lane_detection_lib/route_processing/pyramid.py
+# Coarse-to-fine, multi-resolution lane detection
+
+from typing import Optional
+
+from lane_detection_lib.common import cv2, np, ImageType
+from lane_detection_lib.draw.lines_detection import _separate_lines
+from lane_detection_lib.route_processing.pipeline import (
+    LanePipeline, LaneResult)
+from lane_detection_lib.route_processing.tiled import strip_padding
+
+
+class PyramidDetector:
+    """Detect lanes on a coarse level, then refine them at fine scale.
+
+    Candidate lanes come from the pipeline's own detection chain run on the
+    frame downscaled by ``coarse_scale``. Each candidate is then refined at
+    ``pipeline.scale``: Canny is run only on chunks of ``chunk_rows`` rows
+    covering a band around the candidate, and the lane is refitted on the
+    edge pixels inside that band. ``band_widths`` gives the half-width of
+    the band for each refinement pass, each pass centred on the previous
+    fit, so a wide first pass can absorb coarse errors. Results
+    are in the coordinates of the ``pipeline.scale`` frame, like
+    ``LanePipeline.process``.
+
+    The Hough vote threshold and segment lengths and gaps, given in pixels
+    of the ``pipeline.scale`` frame, are scaled down for the coarse level.
+    Refined lines are held to the same slope and side test as detected
+    segments, so a refit that drifts onto another feature is dropped.
+    """
+
+    def __init__(self, pipeline: LanePipeline, coarse_scale: float = 0.125,
+                 band_widths: tuple[int, ...] = (32, 8),
+                 chunk_rows: int = 32) -> None:
+        if (not isinstance(coarse_scale, (int, float))
+                or not 0 < coarse_scale < pipeline.scale):
+            raise ValueError(
+                "coarse_scale must be positive and below the pipeline scale.")
+
+        if (not isinstance(band_widths, tuple) or not band_widths
+                or not all(isinstance(w, int) and w > 0
+                           for w in band_widths)):
+            raise ValueError(
+                "band_widths must be a tuple of positive integers.")
+
+        if not isinstance(chunk_rows, int) or chunk_rows <= 0:
+            raise ValueError("chunk_rows must be a positive integer.")
+
+        self.pipeline = pipeline
+        self.coarse_scale = coarse_scale
+        self.band_widths = band_widths
+        self.chunk_rows = chunk_rows
+
+        # Segment lengths, and so their votes, shrink with the scale
+        ratio = coarse_scale / pipeline.scale
+        self.coarse_pipeline = LanePipeline(
+            scale=coarse_scale, blur_kernel=pipeline.blur_kernel,
+            blur_deviation=pipeline.blur_deviation,
+            canny_lower=pipeline.canny_lower,
+            canny_higher=pipeline.canny_higher,
+            slope_threshold=pipeline.slope_threshold,
+            line_detector=pipeline.line_detector,
+            left_angles=pipeline.left_angles,
+            right_angles=pipeline.right_angles,
+            fit_method=pipeline.fit_method, lane_cue=pipeline.lane_cue,
+            color_thresholds=pipeline.color_thresholds,
+            min_inlier_ratio=pipeline.min_inlier_ratio,
+            hough_threshold=max(round(pipeline.hough_threshold * ratio), 1),
+            min_line_length=round(pipeline.min_line_length * ratio),
+            max_line_gap=round(pipeline.max_line_gap * ratio))
+
+    def _band_edge_points(self, image: ImageType,
+                          line: tuple[float, float, float, float],
+                          band_width: int, fine_height: int, fine_width: int
+                          ) -> tuple[np.ndarray, np.ndarray]:
+        """Fine-scale edge pixels within the band around a candidate line."""
+        scale = self.pipeline.scale
+        pad = strip_padding(self.pipeline.blur_kernel[1] // 2)
+        x_bottom, y_bottom, x_top, y_top = line
+        slope = (x_top - x_bottom) / (y_top - y_bottom)
+
+        x_parts, y_parts = [], []
+        for y0 in range(int(y_top), int(np.ceil(y_bottom)), self.chunk_rows):
+            y1 = min(y0 + self.chunk_rows, fine_height)
+
+            # Band extent over this chunk, plus Canny context
+            xs = x_bottom + slope * (np.array([y0, y1]) - y_bottom)
+            x0 = max(int(xs.min()) - band_width - pad, 0)
+            x1 = min(int(xs.max()) + band_width + pad + 1, fine_width)
+            cy0, cy1 = max(y0 - pad, 0), min(y1 + pad, fine_height)
+            if x0 >= x1 or cy0 >= cy1:
+                continue
+
+            # Resize only the source pixels behind this chunk
+            source = image[int(cy0 / scale):int(np.ceil(cy1 / scale)),
+                           int(x0 / scale):int(np.ceil(x1 / scale))]
+            chunk = cv2.resize(source, (x1 - x0, cy1 - cy0),
+                               interpolation=cv2.INTER_LINEAR)
+
+            gray = cv2.cvtColor(chunk, cv2.COLOR_BGR2GRAY)
+            blurred = cv2.GaussianBlur(gray, self.pipeline.blur_kernel,
+                                       self.pipeline.blur_deviation)
+            edges = cv2.Canny(blurred, self.pipeline.canny_lower,
+                              self.pipeline.canny_higher)
+
+            points = cv2.findNonZero(edges[y0 - cy0:y1 - cy0])
+            if points is None:
+                continue
+
+            px = points[:, 0, 0] + x0
+            py = points[:, 0, 1] + y0
+            in_band = np.abs(
+                px - (x_bottom + slope * (py - y_bottom))) <= band_width
+            x_parts.append(px[in_band])
+            y_parts.append(py[in_band])
+
+        if not x_parts:
+            return np.empty(0), np.empty(0)
+        return np.concatenate(x_parts), np.concatenate(y_parts)
+
+    def _refine(self, image: ImageType, coarse_line: Optional[tuple[int, ...]],
+                fine_height: int, fine_width: int,
+                left: bool) -> Optional[tuple[int, ...]]:
+        if coarse_line is None:
+            return None
+
+        # Candidate line in fine-scale coordinates
+        factor = self.pipeline.scale / self.coarse_scale
+        line = tuple(coord * factor for coord in coarse_line)
+        line = (line[0], min(line[1], fine_height), line[2], line[3])
+
+        for band_width in self.band_widths:
+            x_coords, y_coords = self._band_edge_points(
+                image, line, band_width, fine_height, fine_width)
+            if len(x_coords) < 2:
+                return None
+
+            line = self.pipeline.fit_points(x_coords, y_coords, fine_height,
+                                            fine_width)
+            if line is None:
+                return None
+
+        # Same slope and side test as the segments of LanePipeline
+        sides = _separate_lines(np.array([line]), fine_width // 2,
+                                self.pipeline.slope_threshold)
+        return line if len(sides[0 if left else 1]) else None
+
+    def detect(self, image: ImageType) -> LaneResult:
+        """Detect lanes on a BGR frame, coarse to fine."""
+        coarse, _ = self.coarse_pipeline.detect(image)
+
+        fine_height = round(image.shape[0] * self.pipeline.scale)
+        fine_width = round(image.shape[1] * self.pipeline.scale)
+
+        return LaneResult(
+            self._refine(image, coarse.left_line, fine_height, fine_width,
+                         left=True),
+            self._refine(image, coarse.right_line, fine_height, fine_width,
+                         left=False))
+
+    def process(self, image: ImageType, render: bool = True) -> LaneResult:
+        """Detect lanes and optionally render them like LanePipeline."""
+        lanes = self.detect(image)
+
+        if not render:
+            return lanes
+
+        resized_image = cv2.resize(image, None, fx=self.pipeline.scale,
+                                   fy=self.pipeline.scale)
+        return lanes._replace(image=self.pipeline.render(
+            resized_image, lanes.left_line, lanes.right_line))
@@ -0,0 +1,286 @@
+# lane_detection/lane_detection_lib/route_processing/tiled.py
+# Strip-wise lane detection for very high resolution frames
+
+from typing import Iterator, NamedTuple
+
+from lane_detection_lib.common import cv2, np, ImageType
+from lane_detection_lib.draw.lines_detection import _separate_lines
+from lane_detection_lib.image.color_segmentation import LaneCue
+from lane_detection_lib.image.edge_detection import LineDetectorType
+from lane_detection_lib.image.hough import _LaneVoter
+from lane_detection_lib.image.roi import _triangular_vertices, MaskColor
+from lane_detection_lib.route_processing.pipeline import (
+    LanePipeline, LaneResult)
+
+# Rows of context needed by Canny around a strip: one for the Sobel
+# aperture plus one for non-maximum suppression.
+CANNY_SUPPORT = 2
+
+# Rough working set per scaled pixel of a strip: the source rows, BGR,
+# gray, blur, two Canny maps, int32 labels, ROI and edge masks, plus the
+# internal buffers of cv2.Canny and cv2.connectedComponents.
+STRIP_BYTES_PER_PIXEL = 40
+
+
+class Strip(NamedTuple):
+    """Rows [start, stop) of the scaled frame and their Canny maps."""
+    start: int
+    stop: int
+    candidates: ImageType  # Local maxima above the lower threshold
+    strong: ImageType  # Local maxima above the higher threshold
+
+
+class _UnionFind:
+    """Growable union-find over component ids."""
+
+    def __init__(self) -> None:
+        self.parent = np.zeros(0, dtype=np.int64)
+
+    def add(self, count: int) -> int:
+        first = len(self.parent)
+        self.parent = np.concatenate(
+            [self.parent, np.arange(first, first + count)])
+        return first
+
+    def find(self, node: int) -> int:
+        root = node
+        while self.parent[root] != root:
+            root = self.parent[root]
+        while self.parent[node] != root:
+            self.parent[node], node = root, self.parent[node]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    def roots(self) -> np.ndarray:
+        # Pointer jumping until every node points at its root
+        roots = self.parent.copy()
+        while not np.array_equal(roots, parents := roots[roots]):
+            roots = parents
+        return roots
+
+
+def strip_padding(blur_radius: int) -> int:
+    """Rows of overlap on each side of a strip, rounded up to even."""
+    pad = blur_radius + CANNY_SUPPORT
+    return pad + pad % 2
+
+
+def plan_strip_rows(scaled_width: int, factor: int, blur_radius: int,
+                    memory_budget: int) -> int:
+    """Number of scaled rows per strip that fits the memory budget."""
+    pad = strip_padding(blur_radius)
+    row_bytes = scaled_width * (STRIP_BYTES_PER_PIXEL + 3 * factor * factor)
+    rows = memory_budget // row_bytes - 2 * pad
+
+    # Even strip starts keep cv2.resize rounding identical to the full frame
+    rows -= rows % 2
+    if rows < 2 * pad:
+        raise ValueError(
+            f"Memory budget of {memory_budget} bytes is too small for "
+            f"frames {scaled_width} pixels wide.")
+    return rows
+
+
+def _iter_strips(image: ImageType, pipeline: LanePipeline, factor: int,
+                 strip_rows: int) -> Iterator[Strip]:
+    """Compute the Canny maps of the scaled frame strip by strip."""
+    pad = strip_padding(pipeline.blur_kernel[1] // 2)
+    height = round(image.shape[0] * pipeline.scale)
+
+    for start in range(0, height, strip_rows):
+        stop = min(start + strip_rows, height)
+        band_start = max(start - pad, 0)
+        band_stop = min(stop + pad, height)
+
+        # Source rows that map onto [band_start, band_stop) after resizing
+        source = image[band_start * factor:
+                       min(band_stop * factor, image.shape[0])]
+        band = cv2.resize(source, None, fx=pipeline.scale,
+                          fy=pipeline.scale)[:band_stop - band_start]
+
+        gray = cv2.cvtColor(band, cv2.COLOR_BGR2GRAY)
+        blurred = cv2.GaussianBlur(gray, pipeline.blur_kernel,
+                                   pipeline.blur_deviation)
+
+        # With equal thresholds Canny skips hysteresis, which is resolved
+        # across strips by the caller.
+        rows = slice(start - band_start, stop - band_start)
+        candidates = cv2.Canny(blurred, pipeline.canny_lower,
+                               pipeline.canny_lower)[rows]
+        strong = cv2.Canny(blurred, pipeline.canny_higher,
+                           pipeline.canny_higher)[rows]
+
+        yield Strip(start, stop, candidates, strong)
+
+
+def _resolve_hysteresis(image: ImageType, pipeline: LanePipeline,
+                        factor: int, strip_rows: int) -> np.ndarray:
+    """Return, per global component, whether it reaches a strong pixel."""
+    components = _UnionFind()
+    strong_components = []
+    previous_row = None
+
+    for strip in _iter_strips(image, pipeline, factor, strip_rows):
+        count, labels = cv2.connectedComponents(strip.candidates,
+                                                connectivity=8)
+        offset = components.add(count - 1) - 1  # Label 0 is background
+        strong_components.append(
+            np.unique(labels[strip.strong > 0]) + offset)
+
+        # Join 8-connected components across the strip boundary
+        first_row = np.where(labels[0] > 0, labels[0] + offset, -1)
+        if previous_row is not None:
+            for shift in (-1, 0, 1):
+                above = np.roll(previous_row, shift)
+                if shift == -1:
+                    above[-1] = -1
+                elif shift == 1:
+                    above[0] = -1
+                touching = (above >= 0) & (first_row >= 0)
+                for a, b in set(zip(above[touching], first_row[touching])):
+                    components.union(int(a), int(b))
+
+        last = labels[-1]
+        previous_row = np.where(last > 0, last + offset, -1)
+
+    roots = components.roots()
+    reaches_strong = np.zeros(len(roots), dtype=bool)
+    for ids in strong_components:
+        reaches_strong[roots[ids]] = True
+
+    return reaches_strong[roots]
+
+
+def _scale_factor(pipeline: LanePipeline) -> int:
+    """Integer downscaling factor of the pipeline."""
+    factor = round(1 / pipeline.scale)
+    if not np.isclose(factor * pipeline.scale, 1):
+        raise ValueError("Tiled processing needs a scale of 1/n.")
+    return factor
+
+
+def _iter_kept_edges(image: ImageType, pipeline: LanePipeline, factor: int,
+                     strip_rows: int,
+                     keep: np.ndarray) -> Iterator[tuple[int, ImageType]]:
+    """Yield the edge strips once hysteresis has been resolved."""
+    offset = 0
+    for strip in _iter_strips(image, pipeline, factor, strip_rows):
+        count, labels = cv2.connectedComponents(strip.candidates,
+                                                connectivity=8)
+        # Component ids are assigned in the same order as the first pass
+        lookup = np.concatenate([[False], keep[offset:offset + count - 1]])
+        offset += count - 1
+
+        yield strip.start, np.where(lookup[labels], 255, 0).astype(np.uint8)
+
+
+def iter_edge_strips(image: ImageType, pipeline: LanePipeline,
+                     memory_budget: int = 64 << 20
+                     ) -> Iterator[tuple[int, ImageType]]:
+    """Yield (first row, Canny edges) strips of the scaled frame.
+
+    Concatenated, the strips equal ``cv2.Canny`` on the full scaled and
+    blurred frame: each strip is computed with enough overlap for the blur
+    kernel and the Canny aperture, and hysteresis is resolved exactly by
+    merging edge components across strips in a first pass. Strip buffers
+    are sized to ``memory_budget`` bytes (excluding the input frame) at the
+    cost of computing every strip twice.
+    """
+    factor = _scale_factor(pipeline)
+    scaled_width = round(image.shape[1] * pipeline.scale)
+    strip_rows = plan_strip_rows(scaled_width, factor,
+                                 pipeline.blur_kernel[1] // 2, memory_budget)
+
+    keep = _resolve_hysteresis(image, pipeline, factor, strip_rows)
+    yield from _iter_kept_edges(image, pipeline, factor, strip_rows, keep)
+
+
+def _roi_strip(height: int, width: int, start: int, stop: int) -> ImageType:
+    """Rows [start, stop) of the triangular ROI mask of a scaled frame."""
+    vertices = _triangular_vertices(height, width)
+    vertices[..., 1] -= start
+
+    mask = np.zeros((stop - start, width), dtype=np.uint8)
+    cv2.fillPoly(mask, vertices, MaskColor.white.value)
+    return mask
+
+
+def detect_lanes_tiled(image: ImageType, pipeline: LanePipeline,
+                       memory_budget: int = 64 << 20,
+                       render: bool = False) -> LaneResult:
+    """Detect lanes on a large BGR frame with bounded working memory.
+
+    Edges match full-frame processing exactly; the ROI mask is drawn per
+    strip and can differ by one pixel along its slanted sides. Only the
+    angle-restricted detector is supported: HoughLinesP is randomized over
+    the whole edge image, so running it per strip finds other segments than
+    on the full frame.
+
+    The masked edges of each strip are voted into fixed-size accumulators,
+    then the strips are computed once more to find the extent of the
+    peaks, which gives the same segments as voting the whole frame. The
+    accumulators and vote buffers count towards ``memory_budget``.
+    """
+    if not isinstance(memory_budget, int) or memory_budget <= 0:
+        raise ValueError("memory_budget must be a positive integer.")
+
+    if pipeline.lane_cue != LaneCue.edges:
+        raise ValueError("Tiled processing only supports edge lane cues.")
+
+    if pipeline.line_detector != LineDetectorType.angle_restricted:
+        raise ValueError(
+            "Tiled processing only supports the angle_restricted detector.")
+
+    factor = _scale_factor(pipeline)
+    height = round(image.shape[0] * pipeline.scale)
+    width = round(image.shape[1] * pipeline.scale)
+
+    # Vote buffers get an eighth of the budget, strips what is left over
+    voter = _LaneVoter(height, width, pipeline.left_angles,
+                       pipeline.right_angles, 1.0, 1.0,
+                       chunk_bytes=memory_budget // 8)
+    try:
+        strip_rows = plan_strip_rows(
+            width, factor, pipeline.blur_kernel[1] // 2,
+            max(memory_budget - voter.nbytes, 0))
+    except ValueError:
+        raise ValueError(
+            f"Memory budget of {memory_budget} bytes is too small for "
+            f"{width}x{height} frames and their Hough accumulators.") from None
+    keep = _resolve_hysteresis(image, pipeline, factor, strip_rows)
+
+    def iter_points() -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        for start, edges in _iter_kept_edges(image, pipeline, factor,
+                                             strip_rows, keep):
+            masked_edges = cv2.bitwise_and(
+                edges, _roi_strip(height, width, start, start + len(edges)))
+            points = cv2.findNonZero(masked_edges)
+            if points is not None:
+                yield points[:, 0, 0], points[:, 0, 1] + start
+
+    for x_coords, y_coords in iter_points():
+        voter.vote(x_coords, y_coords)
+
+    voter.find_peaks(pipeline.hough_threshold)
+    if any(window.peak is not None for window in voter.windows):
+        for x_coords, y_coords in iter_points():
+            voter.track(x_coords, y_coords)
+
+    lines = voter.segments(pipeline.min_line_length)
+
+    left_lines, right_lines = _separate_lines(lines, width // 2,
+                                              pipeline.slope_threshold)
+    result = LaneResult(pipeline.fit_lines(left_lines, height, width),
+                        pipeline.fit_lines(right_lines, height, width))
+
+    if not render:
+        return result
+
+    resized_image = cv2.resize(image, None, fx=pipeline.scale,
+                               fy=pipeline.scale)
+    return result._replace(image=pipeline.render(
+        resized_image, result.left_line, result.right_line))
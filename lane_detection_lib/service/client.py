@@ -0,0 +1,149 @@
+# lane_detection/lane_detection_lib/service/client.py
+# Client and load generator for the lane detection server
+
+import argparse
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from lane_detection_lib.common import Path, logging, np, ImageType
+from lane_detection_lib.image.io import _decode_image
+from lane_detection_lib.route_processing.pipeline import LaneResult
+from lane_detection_lib.service.protocol import (
+    Address, connect, parse_address, recv_message, send_message)
+
+
+class LaneClient:
+    """Blocking client holding one persistent connection to the server."""
+
+    def __init__(self, address: Address) -> None:
+        self._sock = connect(address)
+        self._next_id = 0
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self) -> "LaneClient":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def detect(self, frame: bytes | ImageType, render: bool = False,
+               encoding: str = ".png") -> LaneResult:
+        """Send an encoded (bytes) or raw BGR (ndarray) frame."""
+        header = {"id": self._next_id, "render": render,
+                  "encoding": encoding}
+        self._next_id += 1
+
+        if isinstance(frame, np.ndarray):
+            header.update(format="raw", shape=list(frame.shape))
+            payload = np.ascontiguousarray(frame, dtype=np.uint8).tobytes()
+        else:
+            header["format"] = "encoded"
+            payload = bytes(frame)
+
+        send_message(self._sock, header, payload)
+        message = recv_message(self._sock)
+        if message is None:
+            raise ConnectionError("Server closed the connection.")
+
+        response, body = message
+        if not response.get("ok"):
+            raise RuntimeError(f"Server error: {response.get('error')}")
+
+        left_line, right_line = response["left_line"], response["right_line"]
+        image = _decode_image(body, "server response") if body else None
+        return LaneResult(tuple(left_line) if left_line else None,
+                          tuple(right_line) if right_line else None, image)
+
+
+class LoadReport(NamedTuple):
+    """Latency percentiles (ms) and throughput of a load run."""
+    requests: int
+    errors: int
+    elapsed: float
+    throughput: float
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+def run_load(address: Address, frame: bytes | ImageType,
+             concurrency: int = 4, requests: int = 200,
+             render: bool = False) -> LoadReport:
+    """Send ``requests`` frames from ``concurrency`` client connections.
+
+    A connection that fails stops its worker; every request that did not
+    complete, refused or never sent, counts as an error.
+    """
+    if not isinstance(concurrency, int) or concurrency <= 0:
+        raise ValueError("concurrency must be a positive integer.")
+
+    if not isinstance(requests, int) or requests <= 0:
+        raise ValueError("requests must be a positive integer.")
+
+    latencies: list[float] = []
+    lock = threading.Lock()
+    counts = [requests // concurrency + (i < requests % concurrency)
+              for i in range(concurrency)]
+
+    def worker(count: int) -> None:
+        try:
+            with LaneClient(address) as client:
+                for _ in range(count):
+                    start = time.perf_counter()
+                    try:
+                        client.detect(frame, render)
+                    except (RuntimeError, ValueError):
+                        continue  # Rejected frame, the connection is fine
+                    with lock:
+                        latencies.append(time.perf_counter() - start)
+        except OSError as e:
+            logging.warning(f"Load worker stopped: {e}")
+
+    threads = [threading.Thread(target=worker, args=(count,))
+               for count in counts]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    errors = requests - len(latencies)
+
+    millis = np.array(latencies) * 1000 if latencies else np.zeros(1)
+    p50, p90, p99 = np.percentile(millis, [50, 90, 99])
+    return LoadReport(requests, errors, elapsed, len(latencies) / elapsed,
+                      float(p50), float(p90), float(p99), float(millis.max()))
+
+
+def format_report(report: LoadReport) -> str:
+    """Render a load report as a single human readable line."""
+    return (f"{report.requests} requests ({report.errors} errors) in "
+            f"{report.elapsed:.2f}s: {report.throughput:.1f} req/s, "
+            f"p50 {report.p50:.1f} ms, p90 {report.p90:.1f} ms, "
+            f"p99 {report.p99:.1f} ms, max {report.max:.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load generator for the lane detection server")
+    parser.add_argument("image", help="frame sent with every request")
+    parser.add_argument("--address", default="unix:/tmp/lane_detection.sock",
+                        help="'unix:/path' or 'host:port'")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--render", action="store_true")
+    parser.add_argument("--raw", action="store_true",
+                        help="send decoded frames instead of file bytes")
+    args = parser.parse_args()
+
+    data = Path(args.image).read_bytes()
+    payload: Optional[bytes | ImageType] = (
+        _decode_image(data, args.image) if args.raw else data)
+
+    print(format_report(run_load(parse_address(args.address), payload,
+                                 args.concurrency, args.requests,
+                                 args.render)))
@@ -0,0 +1,89 @@
+# lane_detection/lane_detection_lib/service/protocol.py
+# Wire format shared by the lane detection server and clients
+#
+# Every message is a 4-byte big-endian header length, a JSON header and
+# ``header["size"]`` bytes of payload (an encoded or raw frame, or an
+# encoded rendered image in responses).
+
+import json
+import socket
+import struct
+
+HEADER_LENGTH = struct.Struct(">I")
+MAX_HEADER_SIZE = 1 << 16
+MAX_PAYLOAD_SIZE = 1 << 28  # Fits a raw 8K BGR frame
+
+Address = str | tuple[str, int]
+
+
+def parse_address(address: str) -> Address:
+    """Parse ``unix:/path`` or ``host:port`` into a socket address."""
+    if address.startswith("unix:"):
+        return address[len("unix:"):]
+
+    host, _, port = address.rpartition(":")
+    if not port.isdigit():
+        raise ValueError(f"Invalid address '{address}', expected "
+                         "'unix:/path' or 'host:port'.")
+    return host or "127.0.0.1", int(port)
+
+
+def connect(address: Address) -> socket.socket:
+    """Open a stream socket to a Unix path or a (host, port) pair."""
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    sock.connect(address)
+    return sock
+
+
+def recv_exact(sock: socket.socket, size: int) -> bytes | None:
+    """Read exactly ``size`` bytes; None if the peer closed first."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:])
+        if count == 0:
+            return None
+        received += count
+    return bytes(buffer)
+
+
+def send_message(sock: socket.socket, header: dict,
+                 payload: bytes = b"") -> None:
+    """Send a header and its payload as one message."""
+    header = dict(header, size=len(payload))
+    encoded = json.dumps(header).encode()
+    sock.sendall(HEADER_LENGTH.pack(len(encoded)) + encoded + payload)
+
+
+def recv_message(sock: socket.socket) -> tuple[dict, bytes] | None:
+    """Receive one message; None on a clean end of stream."""
+    prefix = recv_exact(sock, HEADER_LENGTH.size)
+    if prefix is None:
+        return None
+
+    (header_size,) = HEADER_LENGTH.unpack(prefix)
+    if header_size > MAX_HEADER_SIZE:
+        raise ValueError("Message header is too large.")
+
+    raw_header = recv_exact(sock, header_size)
+    if raw_header is None:
+        return None
+    header = json.loads(raw_header)
+    if not isinstance(header, dict):
+        raise ValueError("Message header must be a JSON object.")
+
+    # The size comes from the peer, bound it before allocating
+    size = header.get("size", 0)
+    if not isinstance(size, int) or not 0 <= size <= MAX_PAYLOAD_SIZE:
+        raise ValueError(f"Invalid message payload size: {size!r}")
+
+    payload = recv_exact(sock, size)
+    if payload is None:
+        return None
+
+    return header, payload
@@ -0,0 +1,242 @@
+# lane_detection/lane_detection_lib/service/server.py
+# Long-running lane detection server sharing one warm pipeline
+
+import argparse
+import os
+import queue
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from lane_detection_lib.common import logging, cv2, np, ImageType
+from lane_detection_lib.image.io import _decode_image
+from lane_detection_lib.route_processing.pipeline import (
+    LanePipeline, LaneResult)
+from lane_detection_lib.service.protocol import (
+    Address, parse_address, recv_message, send_message)
+
+
+class RequestBatcher:
+    """Dispatch concurrent frames to a warm pipeline.
+
+    Frames that queued up while the pipeline was busy are taken together,
+    up to ``max_batch`` at a time, optionally waiting ``max_wait`` seconds
+    for more to arrive. With ``workers`` > 1 each frame is handed to a
+    thread pool (OpenCV releases the GIL), and each caller's Future
+    resolves when its own frame is done. At most ``max_batch * workers``
+    frames are in flight; later frames wait in the queue.
+
+    The pipeline has no batched stage: frames taken together are still
+    processed one by one, and ``batches`` only counts how often frames
+    were taken from the queue. Waiting does not raise throughput, so
+    ``max_wait`` defaults to 0.
+    """
+
+    def __init__(self, pipeline: LanePipeline, max_batch: int = 8,
+                 max_wait: float = 0.0, workers: int = 1) -> None:
+        if not isinstance(max_batch, int) or max_batch <= 0:
+            raise ValueError("max_batch must be a positive integer.")
+
+        if not isinstance(max_wait, (int, float)) or max_wait < 0:
+            raise ValueError("max_wait must be a non-negative number.")
+
+        if not isinstance(workers, int) or workers <= 0:
+            raise ValueError("workers must be a positive integer.")
+
+        self.pipeline = pipeline
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self.batches = 0
+        self.frames = 0
+
+        self._queue: queue.Queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(workers) if workers > 1 else None
+        self._in_flight = threading.Semaphore(max_batch * workers)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, image: ImageType, render: bool) -> Future:
+        """Queue a frame and return a Future of its LaneResult."""
+        future = Future()
+        self._queue.put((image, render, future))
+        return future
+
+    def close(self) -> None:
+        """Stop the batching thread once queued frames are done."""
+        self._queue.put(None)
+        self._thread.join()
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _collect(self, first) -> list:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(timeout, 0))
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # Leave the stop marker for _run
+                break
+            batch.append(item)
+        return batch
+
+    def _process_one(self, item) -> None:
+        image, render, future = item
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(self.pipeline.process(image, render))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _run(self) -> None:
+        while (first := self._queue.get()) is not None:
+            batch = self._collect(first)
+            self.batches += 1
+            self.frames += len(batch)
+
+            for item in batch:
+                if self._executor is None:
+                    self._process_one(item)
+                    continue
+
+                # Stop draining the queue while the pool is saturated
+                self._in_flight.acquire()
+                done = self._executor.submit(self._process_one, item)
+                done.add_done_callback(lambda _: self._in_flight.release())
+
+
+def _decode_request(header: dict, payload: bytes) -> ImageType:
+    """Turn a request payload into a BGR frame."""
+    if header.get("format", "encoded") == "raw":
+        shape = tuple(header["shape"])
+        if len(shape) != 3 or shape[2] != 3:
+            raise ValueError("Raw frames must have shape (height, width, 3).")
+        return np.frombuffer(payload, dtype=np.uint8).reshape(shape)
+
+    return _decode_image(payload, "request payload")
+
+
+def _encode_response(result: LaneResult, encoding: str) -> tuple[dict, bytes]:
+    header = {"ok": True, "left_line": result.left_line,
+              "right_line": result.right_line}
+    if result.image is None:
+        return header, b""
+
+    success, encoded = cv2.imencode(encoding, result.image)
+    if not success:
+        raise ValueError(f"Could not encode rendered image as {encoding}")
+    return header, encoded.tobytes()
+
+
+class LaneRequestHandler(socketserver.BaseRequestHandler):
+    """Serve requests of one persistent connection, in order."""
+
+    def handle(self) -> None:
+        batcher: RequestBatcher = self.server.batcher
+        while True:
+            try:
+                message = recv_message(self.request)
+            except (OSError, ValueError) as e:
+                logging.warning(f"Dropping connection: {e}")
+                return
+            if message is None:
+                return
+
+            header, payload = message
+            try:
+                image = _decode_request(header, payload)
+                render = bool(header.get("render", False))
+                result = batcher.submit(image, render).result()
+                response, body = _encode_response(
+                    result, header.get("encoding", ".png"))
+            except Exception as e:
+                response, body = {"ok": False, "error": str(e)}, b""
+
+            response["id"] = header.get("id")
+            try:
+                send_message(self.request, response, body)
+            except OSError:
+                return
+
+
+class _ThreadingUnixServer(socketserver.ThreadingMixIn,
+                           socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class _ThreadingTCPServer(socketserver.ThreadingMixIn,
+                          socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def _is_socket(path: str) -> bool:
+    try:
+        return stat.S_ISSOCK(os.lstat(path).st_mode)
+    except FileNotFoundError:
+        return False
+
+
+def create_server(address: Address, pipeline: LanePipeline,
+                  max_batch: int = 8, max_wait: float = 0.0,
+                  workers: int = 1) -> socketserver.BaseServer:
+    """Bind a server on a Unix socket path or a (host, port) pair.
+
+    The host is bound as given, so ``0.0.0.0`` accepts connections on
+    every interface; ``parse_address`` defaults to the loopback one.
+    """
+    if isinstance(address, str):
+        if _is_socket(address):
+            os.unlink(address)  # Stale socket from a previous run
+        elif os.path.lexists(address):
+            raise FileExistsError(
+                f"Socket path '{address}' exists and is not a socket.")
+        server = _ThreadingUnixServer(address, LaneRequestHandler)
+    else:
+        server = _ThreadingTCPServer(address, LaneRequestHandler)
+
+    server.batcher = RequestBatcher(pipeline, max_batch, max_wait, workers)
+    return server
+
+
+def serve(address: Address, pipeline: Optional[LanePipeline] = None,
+          max_batch: int = 8, max_wait: float = 0.0,
+          workers: int = 1) -> None:
+    """Run the server until interrupted."""
+    server = create_server(address, pipeline or LanePipeline(), max_batch,
+                           max_wait, workers)
+    logging.info(f"Lane detection server listening on {address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.batcher.close()
+        if isinstance(address, str) and _is_socket(address):
+            os.unlink(address)
+        logging.info(f"Served {server.batcher.frames} frames in "
+                     f"{server.batcher.batches} batches")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lane detection server")
+    parser.add_argument("--address", default="unix:/tmp/lane_detection.sock",
+                        help="'unix:/path' or 'host:port'")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=0.0)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format='%(asctime)s - %(levelname)s - %(message)s')
+    serve(parse_address(args.address), max_batch=args.max_batch,
+          max_wait=args.max_wait_ms / 1000, workers=args.workers)